@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+headless benchmark of the simulation
+runs EGame.update for a fixed number of frames on a scaling grid
+and writes frames/sec, frame latency percentiles and peak memory as json
+
+python3 benchmark.py config.json [--frames 600] [--seeds 1 2 3] [--output benchmark.json]
+                                 [--set engine=arrays ...] [--sweep num_food frame ...]
+"""
+from tournament import load_optimizer
+from config import Config
+from fastmode import Fastmode
+from game.egame import EGame
+import argparse
+import contextlib
+import datetime
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    # not available on windows
+    resource = None
+
+
+# every sweep varies one parameter of the config while all others keep their value
+# "frame" scales width and height of the frame (and window)
+SCALING_GRID = {
+    'num_individuals': [10, 20, 40, 80],
+    'num_food': [25, 100, 400, 1600],
+    'num_poison': [30, 120, 480, 1920],
+    'num_predators': [15, 60, 240],
+    'frame': [1, 2, 4],
+}
+
+# the breeders the scaling sweeps are played with (blue, yellow)
+DEFAULT_BREEDERS = ['genetic_algorithm/breeder.py', 'genetic_algorithm/breeder_aggressive.py']
+
+PERCENTILES = [50, 90, 99]
+
+
+def stock_breeders():
+    """
+    all breeders shipped in genetic_algorithm/
+    """
+    return sorted(glob.glob(os.path.join('genetic_algorithm', 'breeder*.py')))
+
+
+def peak_memory():
+    """
+    peak resident memory of this process in MiB (None if unknown)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on mac os
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return peak / 1024
+
+
+def apply_case(global_config, case):
+    """
+    write the parameters of a benchmark case into the global config
+    """
+    for key, value in case.items():
+        if key == 'frame':
+            for area in ['window', 'frame']:
+                global_config[area]['width'] *= value
+                global_config[area]['height'] *= value
+        else:
+            global_config[key] = value
+
+
+def run_case(config_path, overrides, case, breeders, frames, seed, connection):
+    """
+    worker: play one benchmark case in a fresh process and send its measurements back
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    config = Config(config_path)
+    config.global_config.update(overrides)
+    apply_case(config.global_config, case)
+    optimizers = [load_optimizer(path, "opti" + str(i + 1)) for i, path in enumerate(breeders)]
+    memory_before = peak_memory()
+
+    latencies = []
+    # breeders and the game print their progress, keep the benchmark output clean
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        host = Fastmode(seed, config, optimizers)
+        game = EGame(host)
+        game.start()
+        start = time.perf_counter()
+        while game.running and len(latencies) < frames:
+            frame_start = time.perf_counter()
+            game.update()
+            latencies.append(time.perf_counter() - frame_start)
+        total = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    latency = None
+    # no latencies if the game ended before its first frame
+    if len(latencies) > 0:
+        latency = dict([('mean', float(latencies.mean()))] +
+                       [('p' + str(p), float(np.percentile(latencies, p))) for p in PERCENTILES] +
+                       [('max', float(latencies.max()))])
+    connection.send({
+        'frames': len(latencies),
+        # the game ended before all frames were played
+        'game_over': not game.running,
+        'seconds': total,
+        'fps': len(latencies) / total if len(latencies) > 0 and total > 0 else None,
+        'latency_ms': latency,
+        'peak_memory_mb': peak_memory(),
+        'start_memory_mb': memory_before,
+        # time per phase of EGame.update if run with --set metrics=true
+        'phases': game.metrics.summary(),
+    })
+    connection.close()
+
+
+def entity_memory(config_path, connection, count=1000):
+    """
+    worker: bytes allocated per individual, predator and item
+    (shared objects like the config are not counted)
+    """
+    from game.individuals.dot import Dot
+    from game.individuals.predator import Predator
+    from game.items.food import Food
+    from game.items.corpse import Corpse
+    config = Config(config_path)
+    host = Fastmode(0, config, [])
+    color = [(100, 100, 255), "blue"]
+    factories = {
+        'dot': lambda: Dot(host, color=color),
+        'predator': lambda: Predator(host, color=[config.predators['color'], "brown"]),
+        'food': lambda: Food(host, 20),
+        'corpse': lambda: Corpse(host, 20, 0, np.zeros(2), ""),
+    }
+    memory = {}
+    for name, create in factories.items():
+        # create one up front so that lazily created shared objects are not counted
+        create()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        entities = [create() for _ in range(count)]
+        memory[name] = (tracemalloc.get_traced_memory()[0] - before) / count
+        tracemalloc.stop()
+        del entities
+    connection.send(memory)
+    connection.close()
+
+
+def in_process(target, *args):
+    """
+    run target(*args, connection) in a fresh process and return what it sends back
+    """
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=target, args=args + (sender,))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {'error': 'benchmark process crashed'}
+    process.join()
+    return result
+
+
+def measure(config_path, overrides, case, breeders, frames, seed):
+    """
+    run a case in its own process so that peak memory and
+    module state of one case do not leak into the next one
+    """
+    return in_process(run_case, config_path, overrides, case, breeders, frames, seed)
+
+
+def benchmark_cases(sweeps, breeders):
+    """
+    list of (name, case, breeders) of all benchmark runs
+    """
+    cases = []
+    for parameter in sweeps:
+        for value in SCALING_GRID[parameter]:
+            cases.append(('scaling', {parameter: value}, breeders))
+    # every stock breeder plays against itself on the unchanged config
+    for breeder in stock_breeders():
+        cases.append(('breeder', {}, [breeder, breeder]))
+    return cases
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_value(value):
+    """
+    values of --set are json if possible (numbers, booleans), plain strings otherwise
+    """
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the EGame simulation")
+    parser.add_argument('config', help="path to the config.json the cases are based on")
+    parser.add_argument('--frames', type=int, default=600, help="frames per run")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[1, 2, 3])
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--set', nargs='+', default=[], metavar='KEY=VALUE',
+                        help="override global parameters, e.g. engine=arrays")
+    parser.add_argument('--sweep', nargs='+', default=list(SCALING_GRID),
+                        choices=list(SCALING_GRID), help="parameters to scale")
+    parser.add_argument('--breeders', nargs=2, default=DEFAULT_BREEDERS,
+                        metavar=('BLUE', 'YELLOW'), help="breeders of the scaling runs")
+    args = parser.parse_args()
+    if args.frames < 1:
+        parser.error("--frames has to be at least 1")
+
+    overrides = {}
+    for setting in args.set:
+        key, value = setting.split('=', 1)
+        overrides[key] = parse_value(value)
+
+    results = []
+    for kind, case, breeders in benchmark_cases(args.sweep, args.breeders):
+        for seed in args.seeds:
+            result = measure(args.config, overrides, case, breeders, args.frames, seed)
+            result.update({'kind': kind, 'case': case, 'breeders': breeders, 'seed': seed})
+            results.append(result)
+            print(kind, json.dumps(case), os.path.basename(breeders[0]), os.path.basename(breeders[1]),
+                  "seed", seed, "fps", "%.1f" % (result.get('fps') or 0))
+
+    report = {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'config': args.config,
+            'overrides': overrides,
+            'frames': args.frames,
+            'seeds': args.seeds,
+            # bytes per entity
+            'entity_memory': in_process(entity_memory, args.config),
+        },
+        'results': results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+    print("results written to", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,3 +11,132 @@ class Config:
         self.predators = parameter['predators']
         self.items = parameter['items']
         self.ability_base = parameter['ability_base']
+        self.compile()
+
+    def compile(self):
+        """
+        (re)build the frozen parameters from the config dicts
+        has to be called again if the dicts were changed
+        """
+        self.params = Parameters(self)
+        return self.params
+
+
+class Parameters:
+    """
+    frozen copy of the config values which are read every frame
+    individuals read these attributes instead of looking up the config dicts
+    """
+    __slots__ = ('frame_width', 'frame_height', 'border_width',
+                 'max_health', 'start_poison', 'start_size', 'default_dmg',
+                 'max_speed', 'max_force', 'frame_health_reduce',
+                 'perception_absolute',
+                 'predator_speed_factor', 'predator_size', 'predator_default_dmg',
+                 'predator_perception_absolute',
+                 'armor_dmg_reduce', 'max_speed_increase',
+                 'max_poison_reduce', 'toxicity_max_dmg',
+                 'pop1_images', 'pop2_images', 'predator_images',
+                 'items')
+
+    def __init__(self, config):
+        global_config = config.global_config
+        individuals = config.individuals
+        predators = config.predators
+        ability_base = config.ability_base
+        values = {
+            # game area
+            'frame_width': global_config['frame']['width'],
+            'frame_height': global_config['frame']['height'],
+            'border_width': global_config['border_width'],
+            # individuals
+            'max_health': individuals['max_health'],
+            'start_poison': individuals['start_poison'],
+            'start_size': individuals['start_size'],
+            'default_dmg': individuals['default_dmg'],
+            'max_speed': individuals['max_speed'],
+            'max_force': individuals['max_force'],
+            'frame_health_reduce': individuals['frame_health_reduce'],
+            'perception_absolute': individuals['default_perception']['absolute'],
+            # predators
+            'predator_speed_factor': predators['speed_factor'],
+            'predator_size': predators['size'],
+            'predator_default_dmg': predators['default_dmg'],
+            'predator_perception_absolute': predators['default_perception']['absolute'],
+            # abilities
+            'armor_dmg_reduce': ability_base['armor_dmg_reduce'],
+            'max_speed_increase': ability_base['max_speed_increase'],
+            'max_poison_reduce': ability_base['max_poison_reduce'],
+            'toxicity_max_dmg': ability_base['toxicity_max_dmg'],
+            # paths of the animation images, shared by all individuals of a kind
+            'pop1_images': (individuals['image1_pop1'], individuals['image2_pop1']),
+            'pop2_images': (individuals['image1_pop2'], individuals['image2_pop2']),
+            'predator_images': (predators['image1'], predators['image2']),
+            # one ItemParameters per item type, shared by all items of the type
+            'items': {key: ItemParameters(item) for key, item in config.items.items()},
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        # unpickling (e.g. in spawned worker processes) bypasses the read only __setattr__
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("simulation parameters are read only, change the config and call compile()")
+
+    def __delattr__(self, name):
+        raise AttributeError("simulation parameters are read only")
+
+
+class ItemParameters:
+    """
+    frozen copy of the config of one item type
+    items read these attributes instead of looking up the items config
+    """
+    __slots__ = ('size', 'radius', 'color', 'image', 'nutrition')
+
+    def __init__(self, item):
+        values = {
+            'size': item['size'],
+            # half of the size, an item is eaten if it is within this distance
+            'radius': item['size'] / 2,
+            'color': item['color'],
+            'image': item.get('image', ""),
+            # poison has a poisonness instead of a nutrition
+            'nutrition': item.get('nutrition', item.get('poisonness')),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        # unpickling (e.g. in spawned worker processes) bypasses the read only __setattr__
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("simulation parameters are read only, change the config and call compile()")
+
+    def __delattr__(self, name):
+        raise AttributeError("simulation parameters are read only")
+
+
+if __name__ == "__main__":
+    # a compiled config has to survive pickling, spawned worker processes receive copies
+    import pickle
+    import sys
+    config = Config(sys.argv[1] if len(sys.argv) > 1 else "config.json")
+    copied = pickle.loads(pickle.dumps(config))
+    for name in Parameters.__slots__:
+        if name != 'items':
+            assert getattr(copied.params, name) == getattr(config.params, name), name
+    for key, item in config.params.items.items():
+        for name in ItemParameters.__slots__:
+            assert getattr(copied.params.items[key], name) == getattr(item, name), (key, name)
+    print("config pickle round trip ok")
@@ -1,10 +1,12 @@
 from game.egame import EGame
-import threading
 
-class Fastmode(threading.Thread):
-    def __init__(self, threadid, config, optimizers):
-        threading.Thread.__init__(self)
-        self.threadid = threadid
+class Fastmode:
+    """
+    headless host of one game without any window
+    the tournament runs every game in its own process
+    """
+    def __init__(self, game_id, config, optimizers):
+        self.game_id = game_id
         self.config = config
         self.optimizers = optimizers
         self.global_config = self.config.global_config
@@ -18,14 +20,16 @@ class Fastmode(threading.Thread):
         self.fg = FrameGeometry(self.global_config['frame']['width'],
                                 self.global_config['frame']['height'])
         self.msg2Statusbar = Msg2StatusBar()
+        # frames played per call of game.step
+        self.steps_per_call = 1000
 
 
     def run(self):
-        print("starting thread", self.threadid)
+        print("starting game", self.game_id)
         game = EGame(self)
         game.start()
         while game.running:
-            game.update()
+            game.step(self.steps_per_call)
         # result is the winner of the game
         # 0 = blue breeder, 1 = yellow breeder
         self.result = game.result
@@ -0,0 +1,89 @@
+import numpy as np
+
+from game.individuals.genome import genome_matrix
+
+# diversity of the genomes of a population, computed on (n, 17) genome arrays
+# two genomes are "diverse" if none of their genes is equal after rounding
+# (the condition of is_diverse in the breeders)
+
+
+def gene_bins(genomes, accuracy):
+    """
+    genes rounded to the given number of decimals, as integers
+    two genes are considered equal if their bins are equal
+    """
+    return np.rint(np.asarray(genomes) * 10 ** accuracy).astype(np.int64)
+
+
+def collision_matrix(genomes, accuracy=2):
+    """
+    (n, n) boolean matrix, True if two genomes share a rounded gene (not diverse)
+    a genome does not collide with itself
+    """
+    bins = gene_bins(np.atleast_2d(genomes), accuracy)
+    collisions = (bins[:, None, :] == bins[None, :, :]).any(axis=2)
+    np.fill_diagonal(collisions, False)
+    return collisions
+
+
+def diverse_to(genomes, genome, accuracy=2):
+    """
+    boolean per row of genomes, True if the row shares no rounded gene with genome
+    """
+    bins = gene_bins(np.atleast_2d(genomes), accuracy)
+    return ~(bins == gene_bins(genome, accuracy)).any(axis=1)
+
+
+def distance_matrix(genomes):
+    """
+    (n, n) euclidean distances between the genomes
+    """
+    genomes = np.atleast_2d(genomes)
+    differences = genomes[:, None, :] - genomes[None, :, :]
+    return np.sqrt((differences ** 2).sum(axis=2))
+
+
+def mean_pairwise_distance(genomes):
+    """
+    mean euclidean distance of all pairs of different genomes (0 for less than two)
+    """
+    n = len(genomes)
+    if n < 2:
+        return 0.0
+    # the diagonal is 0, every pair is counted twice
+    return float(distance_matrix(genomes).sum() / (n * (n - 1)))
+
+
+def gene_entropy(genomes, bins=10):
+    """
+    shannon entropy (in bits) of the distribution of every gene over bins equal intervals of [0, 1]
+    0 if all individuals have the same value, log2(bins) if they are spread evenly
+    """
+    genomes = np.atleast_2d(genomes)
+    if len(genomes) == 0:
+        return np.zeros(genomes.shape[1])
+    indices = np.minimum((genomes * bins).astype(np.int64), bins - 1)
+    # histogram of every gene (column)
+    counts = np.zeros((bins, genomes.shape[1]))
+    np.add.at(counts, (indices, np.arange(genomes.shape[1])), 1)
+    probabilities = counts / len(genomes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0)
+    return -terms.sum(axis=0)
+
+
+def population_diversity(population, accuracy=2):
+    """
+    diversity metrics of a population (list of dots) for breeders and logs
+    mean_distance: mean pairwise genome distance
+    gene_entropy: mean entropy of the genes in bits
+    collisions: share of the pairs which are not diverse
+    """
+    genomes = genome_matrix(population)
+    n = len(genomes)
+    pairs = n * (n - 1)
+    return {
+        'mean_distance': mean_pairwise_distance(genomes),
+        'gene_entropy': float(gene_entropy(genomes).mean()) if n else 0.0,
+        'collisions': float(collision_matrix(genomes, accuracy).sum() / pairs) if pairs else 0.0,
+    }
@@ -0,0 +1,75 @@
+import functools
+
+# memoization of fitness functions for the duration of one breed call
+#
+#   class Breeder:
+#       @breeding_round
+#       def breed(self, population):
+#           ...
+#
+#       @cached_fitness
+#       def assess_individual_fitness(self, individual):
+#           ...
+#
+# every individual is assessed once per breed call, a score is computed again
+# only if the traits (dna_to_traits) of the individual changed or it got a new statistic
+# (the versions of the statistics are stamped by EGame.breed before each breeding round)
+
+
+class FitnessCache:
+    """
+    scores of the individuals of one breeding round
+    keyed by the function, the individual and the versions of its traits and statistic
+    """
+    def __init__(self):
+        self.scores = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, name, individual):
+        # copies of an individual share its uid, they differ once their traits are changed
+        return (name, individual.uid, individual.dna_version, individual.statistic.version)
+
+    def get(self, name, individual, assess):
+        """
+        the cached score of the individual, assess() is called if there is none
+        """
+        key = self.key(name, individual)
+        if key in self.scores:
+            self.hits += 1
+            return self.scores[key]
+        self.misses += 1
+        score = assess()
+        self.scores[key] = score
+        return score
+
+
+def breeding_round(breed):
+    """
+    decorator for Breeder.breed (or any method which gets the population)
+    the fitness cache lives as long as the call
+    """
+    @functools.wraps(breed)
+    def breed_with_cache(self, population, *args, **kwargs):
+        self.fitness_cache = FitnessCache()
+        try:
+            return breed(self, population, *args, **kwargs)
+        finally:
+            self.fitness_cache = None
+    return breed_with_cache
+
+
+def cached_fitness(assess):
+    """
+    decorator for methods assess(self, individual) -> score
+    the score is computed once per individual and breeding round
+    (outside of a breeding round every call is computed)
+    scores are shared between the calls and must not be changed by the caller
+    """
+    @functools.wraps(assess)
+    def assess_with_cache(self, individual):
+        cache = getattr(self, 'fitness_cache', None)
+        if cache is None:
+            return assess(self, individual)
+        return cache.get(assess.__name__, individual, lambda: assess(self, individual))
+    return assess_with_cache
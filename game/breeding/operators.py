@@ -0,0 +1,152 @@
+import numpy as np
+
+from game.individuals.genome import BLOCKS, GENOME_LENGTH
+
+# genetic operators on (n, 17) genome arrays (see game.individuals.genome)
+# every row is one child, all children of a generation are changed at once
+# perception, desires and abilities are simplices (each block sums up to 1.0),
+# every operator returns new genomes which pass Trait.check_dna
+
+
+def normalize(genomes):
+    """
+    negative genes are set to 0 and every block is scaled to sum up to 1.0
+    a block without any value becomes uniform
+    """
+    genomes = np.clip(np.atleast_2d(np.asarray(genomes, dtype=float)), 0.0, None)
+    for block in BLOCKS:
+        sums = genomes[:, block].sum(axis=1, keepdims=True)
+        empty = sums[:, 0] <= 0.0
+        genomes[empty, block] = 1.0
+        sums[empty] = block.stop - block.start
+        genomes[:, block] /= sums
+    return genomes
+
+
+def random_genomes(count):
+    """
+    count genomes drawn uniformly from the three simplices
+    """
+    return normalize(np.random.gamma(1.0, size=(count, GENOME_LENGTH)))
+
+
+def block_crossover(genomes_a, genomes_b, chance=0.5):
+    """
+    every block (perception, desires, abilities) of a pair of parents
+    is swapped with the given chance, row i of a is paired with row i of b
+    returns the two children of every pair
+    """
+    children_a = np.array(np.atleast_2d(genomes_a), dtype=float)
+    children_b = np.array(np.atleast_2d(genomes_b), dtype=float)
+    for block in BLOCKS:
+        swap = np.random.uniform(0, 1, len(children_a)) < chance
+        children_a[swap, block], children_b[swap, block] = children_b[swap, block], children_a[swap, block]
+    return normalize(children_a), normalize(children_b)
+
+
+def uniform_crossover(genomes_a, genomes_b, chance=0.5):
+    """
+    every gene of a pair of parents is swapped with the given chance
+    the blocks of the children are normalized afterwards
+    """
+    children_a = np.array(np.atleast_2d(genomes_a), dtype=float)
+    children_b = np.array(np.atleast_2d(genomes_b), dtype=float)
+    swap = np.random.uniform(0, 1, children_a.shape) < chance
+    children_a[swap], children_b[swap] = children_b[swap], children_a[swap]
+    return normalize(children_a), normalize(children_b)
+
+
+def group_crossover(genomes_a, genomes_b, groups, chance=1.0):
+    """
+    with the given chance one random group of genes (a sequence of columns)
+    is swapped between a pair of parents, e.g. all genes related to food
+    the blocks of the children are normalized afterwards
+    """
+    children_a = np.array(np.atleast_2d(genomes_a), dtype=float)
+    children_b = np.array(np.atleast_2d(genomes_b), dtype=float)
+    crossed = np.random.uniform(0, 1, len(children_a)) < chance
+    group = np.random.randint(0, len(groups), len(children_a))
+    for index, columns in enumerate(groups):
+        rows = np.flatnonzero(crossed & (group == index))[:, None]
+        columns = np.asarray(columns)[None, :]
+        children_a[rows, columns], children_b[rows, columns] = children_b[rows, columns], children_a[rows, columns]
+    return normalize(children_a), normalize(children_b)
+
+
+def shift_values(values, increase, amount):
+    """
+    values is a (n, k) array of one block, every row moves amount from a random
+    other gene which has at least amount to the gene increase (column in the block)
+    rows without such a gene stay unchanged, the sum of every row is kept
+    increase and amount are a number or one per row
+    """
+    values = np.array(np.atleast_2d(values), dtype=float)
+    n, width = values.shape
+    rows = np.arange(n)
+    increase = np.broadcast_to(increase, n)
+    amount = np.broadcast_to(np.asarray(amount, dtype=float), n)
+    candidates = values >= amount[:, None]
+    candidates[rows, increase] = False
+    # a random candidate per row is the one with the largest random key
+    keys = np.where(candidates, np.random.uniform(0, 1, (n, width)), -1.0)
+    decrease = keys.argmax(axis=1)
+    shifted = rows[candidates.any(axis=1)]
+    values[shifted, decrease[shifted]] -= amount[shifted]
+    values[shifted, increase[shifted]] += amount[shifted]
+    return values
+
+
+def shift_mutation(genomes, block, increase, amount):
+    """
+    shift_values on one block of the genomes (e.g. genome.DESIRES)
+    increase is the column in the block, amount what is moved to it
+    """
+    genomes = np.array(np.atleast_2d(genomes), dtype=float)
+    genomes[:, block] = shift_values(genomes[:, block], increase, amount)
+    return normalize(genomes)
+
+
+def swap_mutation(genomes, blocks, chance=1.0):
+    """
+    with the given chance two random genes are swapped in every given block,
+    the genes have the same columns in all blocks (e.g. food in perception and desires)
+    the blocks must have the same width
+    """
+    genomes = np.array(np.atleast_2d(genomes), dtype=float)
+    width = blocks[0].stop - blocks[0].start
+    rows = np.flatnonzero(np.random.uniform(0, 1, len(genomes)) < chance)
+    first = np.random.randint(0, width, len(rows))
+    second = np.random.randint(0, width, len(rows))
+    for block in blocks:
+        a = block.start + first
+        b = block.start + second
+        genomes[rows, a], genomes[rows, b] = genomes[rows, b], genomes[rows, a]
+    return normalize(genomes)
+
+
+def gaussian_mutation(genomes, sigma=0.05, chance=1.0):
+    """
+    every gene gets normal noise with the given chance,
+    negative genes are cut at 0 and the blocks are normalized afterwards
+    """
+    genomes = np.array(np.atleast_2d(genomes), dtype=float)
+    mutated = np.random.uniform(0, 1, genomes.shape) < chance
+    genomes[mutated] += np.random.normal(0, sigma, np.count_nonzero(mutated))
+    return normalize(genomes)
+
+
+def dirichlet_mutation(genomes, concentration=50.0, chance=1.0, minimum=1e-3):
+    """
+    with the given chance every block is resampled from a dirichlet distribution
+    around its current values, a higher concentration stays closer to them
+    (concentration 0 draws the block uniformly from its simplex)
+    """
+    genomes = np.array(np.atleast_2d(genomes), dtype=float)
+    for block in BLOCKS:
+        rows = np.flatnonzero(np.random.uniform(0, 1, len(genomes)) < chance)
+        alpha = np.maximum(concentration * genomes[rows, block], minimum)
+        if concentration == 0:
+            alpha[:] = 1.0
+        # a dirichlet sample is a gamma sample per gene divided by the sum of the block
+        genomes[rows, block] = np.random.gamma(alpha)
+    return normalize(genomes)
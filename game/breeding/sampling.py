@@ -0,0 +1,94 @@
+import warnings
+from random import choice
+
+import numpy as np
+
+from game.individuals.genome import BLOCKS, GENOME_LENGTH
+from game.breeding.diversity import gene_bins
+
+# sampling for breeders with a bounded runtime instead of rejection loops
+
+
+class Buckets:
+    """
+    individuals grouped by key(individual), e.g. their main trait or profession
+    the key is computed once per individual, a member of a group is drawn in O(1)
+    """
+    def __init__(self, population, key):
+        self.groups = {}
+        for individual in population:
+            self.groups.setdefault(key(individual), []).append(individual)
+
+    def __len__(self):
+        return len(self.groups)
+
+    def __contains__(self, key):
+        return key in self.groups
+
+    def keys(self):
+        return self.groups.keys()
+
+    def members(self, key):
+        """
+        all individuals with the given key (empty list if there is none)
+        """
+        return self.groups.get(key, [])
+
+    def draw(self, key, default=None):
+        """
+        random individual with the given key, default if there is none
+        """
+        group = self.groups.get(key)
+        if not group:
+            return default
+        return choice(group)
+
+
+def diverse_genomes(count, accuracy=2, existing=None, attempts=100):
+    """
+    count random genomes whose genes, rounded to accuracy decimals, differ
+    from the same gene of every other new genome and of the existing genomes
+    (the condition of is_diverse in the breeders)
+    the condition holds per gene, so every block is sampled on its own
+    at most attempts * count candidates are drawn per block, if they are not enough
+    (more than about 20 genomes with accuracy 2) the remaining rows are the
+    candidates with the fewest equal genes and a warning is given
+    """
+    genomes = np.empty((count, GENOME_LENGTH))
+    # the first rows are diverse in every block, the fallback rows come last
+    diverse = count
+    for block in BLOCKS:
+        width = block.stop - block.start
+        # bins which are taken for every gene of the block
+        taken = [set() for _ in range(width)]
+        if existing is not None and len(existing) > 0:
+            for gene, column in enumerate(gene_bins(np.atleast_2d(existing)[:, block], accuracy).T):
+                taken[gene].update(column.tolist())
+        rows = []
+        for _ in range(attempts):
+            candidates = np.random.dirichlet(np.ones(width), count)
+            for candidate, bins in zip(candidates, gene_bins(candidates, accuracy).tolist()):
+                if any(value in taken[gene] for gene, value in enumerate(bins)):
+                    continue
+                for gene, value in enumerate(bins):
+                    taken[gene].add(value)
+                rows.append(candidate)
+                if len(rows) == count:
+                    break
+            if len(rows) == count:
+                break
+        diverse = min(diverse, len(rows))
+        while len(rows) < count:
+            # the number of diverse rows is limited, the rest collides as little as possible
+            candidates = np.random.dirichlet(np.ones(width), attempts)
+            bins = gene_bins(candidates, accuracy).tolist()
+            collisions = [sum(value in taken[gene] for gene, value in enumerate(row)) for row in bins]
+            best = int(np.argmin(collisions))
+            for gene, value in enumerate(bins[best]):
+                taken[gene].add(value)
+            rows.append(candidates[best])
+        genomes[:, block] = np.reshape(rows, (count, width))
+    if diverse < count:
+        warnings.warn("only " + str(diverse) + " of " + str(count) + " genomes are diverse with accuracy "
+                      + str(accuracy) + ", the others share genes", RuntimeWarning)
+    return genomes
@@ -0,0 +1,66 @@
+import numpy as np
+
+# parent selection on fitness arrays
+# the cumulative fitness is built once per breeding round,
+# every draw is a binary search on it instead of a walk over the population
+
+
+def cumulative_fitness(fitness):
+    """
+    running sum of the fitness values (fitness[i] summed up to i)
+    """
+    return np.cumsum(np.asarray(fitness, dtype=float))
+
+
+def sus(cumulative, count):
+    """
+    stochastic universal sampling
+    count indices with equally spaced pointers over the cumulative fitness
+    """
+    return sus_pairs(cumulative, 1, count)[0]
+
+
+def sus_pairs(cumulative, pairs, count=2):
+    """
+    stochastic universal sampling for many children at once
+    (pairs, count) indices, every row is drawn like sus(cumulative, count)
+    """
+    total = cumulative[-1]
+    step = total / count
+    # one random start per row, then count pointers step apart
+    offsets = np.random.uniform(0, step, (pairs, 1)) + step * np.arange(count)
+    return pick(cumulative, offsets)
+
+
+def roulette(cumulative, count):
+    """
+    count independent indices, each with a probability proportional to its fitness
+    """
+    return pick(cumulative, np.random.uniform(0, cumulative[-1], count))
+
+
+def pick(cumulative, offsets):
+    """
+    index of the first cumulative fitness which reaches the offset
+    """
+    indices = np.searchsorted(cumulative, offsets, side='left')
+    # rounding may push an offset past the total
+    return np.minimum(indices, len(cumulative) - 1)
+
+
+def tournament(fitness, count, size=2):
+    """
+    count tournaments of size randomly chosen individuals (with replacement)
+    index of the fittest individual of every tournament
+    """
+    fitness = np.asarray(fitness)
+    candidates = np.random.randint(0, len(fitness), (count, size))
+    winners = np.argmax(fitness[candidates], axis=1)
+    return candidates[np.arange(count), winners]
+
+
+def tournament_pairs(fitness, pairs, size=2):
+    """
+    two tournament winners as parents for every child, (pairs, 2) indices
+    """
+    return tournament(fitness, 2 * pairs, size).reshape(pairs, 2)
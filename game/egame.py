@@ -3,20 +3,30 @@ import numpy as np
 from random import uniform, randint, choice
 from game.individuals.dot import Dot
 from game.individuals.predator import Predator
+from game.individuals.genome import DESIRES
+from game.individuals.statistic import StatisticTable
 from game.items.food import Food
 from game.items.poison import Poison
 from game.items.heal_potion import HealPotion
 from game.items.corpse import Corpse
 from game.individuals.invalid_population_exception import InvalidPopulationException
-
-from PyQt5.QtGui import QPainter, QColor, QFont, QBrush, QPen
-from PyQt5.QtCore import QPoint, Qt
+from game.world_state import PopulationState
+from game.spatial_list import SpatialList, ItemList
+from game.visibility import query_visible
+from game.metrics import PhaseMetrics, NoMetrics
+from game import steering
+import itertools
 
 class EGame:
+    # numbers the games of this process
+    serials = itertools.count()
 
     def __init__(self, parent):
         self.parent = parent
         self.config = self.parent.config
+        # frozen parameters read by the individuals (built again
+        # in case the config dicts were changed after loading)
+        self.params = self.config.compile()
         self.global_parameter = self.config.global_config
         self.predator_config = self.config.predators
         self.num_individuals = self.global_parameter['num_individuals']
@@ -32,6 +42,24 @@ class EGame:
         self.spawn_prob_rainbow_drops = self.global_parameter['spawn_prob_rainbow_drops']
         self.spawn_prob_predator = self.global_parameter['spawn_prob_predators']
         self.image_swap_frame = self.global_parameter['image_swap_frame']
+        # "objects" updates every individual on its own
+        # "arrays" keeps the individuals in a PopulationState per group
+        # and updates them with whole-array operations
+        self.array_engine = self.global_parameter.get('engine', 'objects') == 'arrays'
+        # all game objects are bucketed in a grid with cells of the size
+        # of the largest perception radius unless configured otherwise
+        self.spatial_cell_size = self.global_parameter.get('spatial_cell_size') or \
+            max(self.config.individuals['default_perception']['absolute'],
+                self.predator_config['default_perception']['absolute'])
+        # query the visible objects of all individuals once per frame and type
+        # instead of letting every individual search on its own
+        self.batched_queries = self.global_parameter.get('batched_queries', False)
+        # wall time and call counts of the phases of update (off by default)
+        if self.global_parameter.get('metrics', False):
+            self.metrics = PhaseMetrics(self.global_parameter.get('metrics_dump_frames', 0),
+                                        self.global_parameter.get('metrics_file', ""))
+        else:
+            self.metrics = NoMetrics()
     
         self.item_config = self.config.items
 
@@ -46,8 +74,14 @@ class EGame:
         self.colors["pop2"] = [(255, 165, 0), "yellow"]
 
         self.game_objects = {}
+        # PopulationState for pop1, pop2 and predators (array engine only)
+        self.states = {}
+        # StatisticTable of pop1 and pop2, the rows are in the order of the populations
+        self.statistics = {}
         self.running = False
         self.frame_counter = 0
+        self.frames_played = 0
+        self.serial = next(EGame.serials)
 
     def start(self):
         """
@@ -55,18 +89,18 @@ class EGame:
         add individuals to populations
         add food | poison | potions
         """
-        self.game_objects['pop1'] = []
-        self.game_objects['pop2'] = []
-        self.game_objects['food'] = []
-        self.game_objects['poison'] = []
-        self.game_objects['health_potion'] = []
-        self.game_objects['corpse'] = []
-        self.game_objects['predators'] = []
+        # items are removed all the time, they are stored with
+        # constant time removal and reused when they respawn
+        self.game_objects['food'] = ItemList(self.spatial_cell_size)
+        self.game_objects['poison'] = ItemList(self.spatial_cell_size)
+        self.game_objects['health_potion'] = ItemList(self.spatial_cell_size)
+        self.game_objects['corpse'] = ItemList(self.spatial_cell_size)
+        self.game_objects['predators'] = SpatialList(self.spatial_cell_size)
 
-        self.game_objects['pop1'] = self.breeder_pop1.initialize_population(
-            self.num_individuals, self.colors['pop1'])
-        self.game_objects['pop2'] = self.breeder_pop2.initialize_population(
-            self.num_individuals, self.colors['pop2'])
+        self.game_objects['pop1'] = SpatialList(self.spatial_cell_size,
+            self.breeder_pop1.initialize_population(self.num_individuals, self.colors['pop1']))
+        self.game_objects['pop2'] = SpatialList(self.spatial_cell_size,
+            self.breeder_pop2.initialize_population(self.num_individuals, self.colors['pop2']))
 
         # for _ in range(self.num_individuals):
         #     self.game_objects['pop1'].append(Dot(self.parent, color=self.colors['pop1'][0]))
@@ -77,19 +111,61 @@ class EGame:
             self.game_objects['poison'].append(Poison(self.parent, self.border_width))
         for _ in range(self.num_health_potions):
             self.game_objects['health_potion'].append(HealPotion(self.parent, self.border_width))
+
+        for group in ['pop1', 'pop2', 'predators']:
+            self.bind_state(group)
         
         self.running = True
 
 
+    def bind_state(self, group):
+        """
+        (re)build the array state of a group after its members changed
+        """
+        if group in self.colors:
+            self.statistics[group] = StatisticTable(self.game_objects[group])
+        if self.array_engine:
+            self.states[group] = PopulationState(self.game_objects[group])
+
+
+    def step(self, n=1, callback=None, every=1):
+        """
+        advance the game by n frames in one call (stops early if the game ends)
+        callback(game) is called after every k-th frame if given
+        returns the number of frames played
+        """
+        if n < 0:
+            raise ValueError("step needs a number of frames >= 0, got " + str(n))
+        if every < 1:
+            raise ValueError("step needs a callback interval >= 1, got " + str(every))
+        frames = 0
+        while frames < n and self.running:
+            self.update()
+            frames += 1
+            if callback is not None and frames % every == 0:
+                callback(self)
+        return frames
+
+
     def update(self):
         """
         update all game elements frame by frame
         increment breeding timer and apply breeding
         """
-        self.update_population(self.game_objects['pop1'], opponent="pop2")
-        self.update_population(self.game_objects['pop2'], opponent="pop1")
-        self.update_predators(self.game_objects['predators'])
+        if self.array_engine:
+            self.update_population_arrays('pop1', opponent="pop2")
+            self.update_population_arrays('pop2', opponent="pop1")
+            start = self.metrics.clock()
+            self.update_predators_arrays()
+        else:
+            self.update_population(self.game_objects['pop1'], opponent="pop2")
+            self.update_population(self.game_objects['pop2'], opponent="pop1")
+            start = self.metrics.clock()
+            self.update_predators(self.game_objects['predators'])
+        self.metrics.record('predators', start)
+        start = self.metrics.clock()
         self.create_items()
+        self.metrics.record('create_items', start)
         self.breeding_timer += 1
         if self.breeding_timer == self.global_parameter['breeding_frame']:
             #print("BREEDING TIME")
@@ -97,8 +173,10 @@ class EGame:
             self.breed('pop2', breeder=self.breeder_pop2)
             self.breeding_timer = 0
         self.frame_counter += 1
+        self.frames_played += 1
         # swap the image
         if self.frame_counter == self.image_swap_frame:
+            start = self.metrics.clock()
             self.frame_counter = 0
             for blue in self.game_objects['pop1']:
                 blue.swap_display_image()
@@ -106,6 +184,8 @@ class EGame:
                 yellow.swap_display_image()
             for predator in self.game_objects['predators']:
                 predator.swap_display_image()
+            self.metrics.record('image_swap', start)
+        self.metrics.end_frame()
             
     
 
@@ -113,11 +193,22 @@ class EGame:
         """
         breed populations with given optimizer
         """
-        breeded_population = breeder.breed(self.game_objects[population])
+        # new versions for the counters of this round,
+        # the fitness caches of the breeders are keyed by them
+        for individual in self.game_objects[population]:
+            individual.statistic.stamp()
+        # breeders work on plain lists, the grid is rebuilt afterwards
+        start = self.metrics.clock()
+        breeded_population = breeder.breed(list(self.game_objects[population]))
+        self.metrics.record('breed_' + population, start)
         # check if the population exceeds its individual limit
         if len(breeded_population) > self.num_individuals:
             raise InvalidPopulationException("Population exceeds its maximum individual count!")
-        self.game_objects[population] = breeded_population
+        # breeders may have swapped the traits of individuals
+        for individual in breeded_population:
+            individual.derive_traits()
+        self.game_objects[population] = SpatialList(self.spatial_cell_size, breeded_population)
+        self.bind_state(population)
 
 
     
@@ -129,6 +220,21 @@ class EGame:
         self.create_poison()
         self.create_potion()
         self.create_predators()
+        for type in ['food', 'poison', 'health_potion', 'corpse']:
+            self.game_objects[type].end_frame()
+
+
+    def spawn_item(self, type, item_class, *args, **kwargs):
+        """
+        add an item of the given type, a removed item is reused if possible
+        args are the arguments of the item constructor after parent and boundary
+        """
+        item = self.game_objects[type].reuse()
+        if item is None:
+            item = item_class(self.parent, self.border_width, *args, **kwargs)
+        else:
+            item.reset(self.border_width, *args, **kwargs)
+        self.game_objects[type].append(item)
 
     
     def create_food(self):
@@ -139,8 +245,7 @@ class EGame:
             uniform(0, 1) < self.spawn_prob_food
             and len(self.game_objects['food']) < self.num_food
         ):
-            self.game_objects['food'].append(
-                Food(self.parent, self.border_width))
+            self.spawn_item('food', Food)
 
     
     def create_poison(self):
@@ -151,8 +256,7 @@ class EGame:
             uniform(0, 1) < self.spawn_prob_poison
             and len(self.game_objects['poison']) < self.num_poison
         ):
-            self.game_objects['poison'].append(
-                Poison(self.parent, self.border_width))
+            self.spawn_item('poison', Poison)
     
     
     def create_potion(self):
@@ -163,9 +267,7 @@ class EGame:
             uniform(0, 1) < self.spawn_prob_potion
             and len(self.game_objects['health_potion']) < self.num_health_potions
         ):
-            self.game_objects['health_potion'].append(
-                HealPotion(self.parent, self.border_width)
-            )
+            self.spawn_item('health_potion', HealPotion)
 
     
     def create_predators(self):
@@ -179,47 +281,206 @@ class EGame:
             self.game_objects['predators'].append(
                 Predator(self.parent, color=[self.predator_config['color'], "brown"])
             )
+            self.bind_state('predators')
 
     
     def update_population(self, population, opponent):
         """
         update all individuals in all populations
         """
-        # check variable for end of session
-        all_dead = True
+        metrics = self.metrics
+        # health and corpses of all individuals first (as in update_population_arrays),
+        # so every individual sees who died and which corpses were generated in this frame
+        start = metrics.clock()
         visited = set()
+        seekers = []
         for i in population:
             if i in visited:
                 continue
             visited.add(i)
             # if the individual is not dead
-            if not i.dead:
-                i.decrase_health()
-                if i.health <= 0.0:
-                    # generate a corpse at the position where the individual died
-                    self.game_objects["corpse"].append(Corpse(self.parent, 
-                                                            self.border_width,
-                                                            i.poison,
-                                                            position=i._position,
-                                                            corpse_image=i.corpse_image))
-                    i.dead = True
-                    continue
-                # there is still an individual living
-                all_dead = False
-                # it survived a frame longer
-                i.increment_survived_time()
-                # apply seek algorithm
-                i.seek(self.game_objects, opponent)
-                # apply the boundary force to stay in game area
-                i.stay_in_boundaries(self.border_width)
-                # apply acceleration to velocity
-                i.update()
+            if not i.dead and self.update_health(i):
+                seekers.append(i)
+        start = metrics.record('health', start)
+        # check variable for end of session
+        all_dead = len(seekers) == 0
+        if self.batched_queries and seekers:
+            visible = self.query_visible(seekers, self.population_queries(opponent))
+            metrics.record('seek', start, calls=0)
+        else:
+            visible = [None] * len(seekers)
+        for i, seen in zip(seekers, visible):
+            self.move_individual(i, population, opponent, seen)
+        if seekers:
+            # one call per population, as in update_population_arrays
+            metrics.count('seek', 'boundaries', 'integration')
 
         # check if all individuals are dead
         if all_dead:
             self.result = self.end_game()
 
     
+    def update_health(self, i):
+        """
+        decrease the health of a living individual
+        it dies and leaves a corpse if there is no health left
+        returns if the individual is still alive
+        """
+        i.decrase_health()
+        if i.health <= 0.0:
+            # generate a corpse at the position where the individual died
+            self.spawn_item("corpse", Corpse,
+                            i.poison,
+                            position=np.copy(i._position),
+                            corpse_image=i.corpse_image)
+            i.dead = True
+            return False
+        # it survived a frame longer
+        i.increment_survived_time()
+        return True
+
+
+    def move_individual(self, i, population, opponent, visible=None):
+        """
+        seek, boundaries and movement of a living individual
+        visible are the candidates of query_visible (None to search all objects)
+        """
+        # the time is added to the phases, they are counted once per population
+        metrics = self.metrics
+        start = metrics.clock()
+        # apply seek algorithm
+        i.seek(self.game_objects, opponent, visible)
+        start = metrics.record('seek', start, calls=0)
+        # apply the boundary force to stay in game area
+        i.stay_in_boundaries(self.border_width)
+        start = metrics.record('boundaries', start, calls=0)
+        # apply acceleration to velocity
+        i.update()
+        population.move(i)
+        metrics.record('integration', start, calls=0)
+
+
+    def update_population_arrays(self, population, opponent):
+        """
+        update all individuals of a population with the array engine
+        health, steering and movement are updated for the whole population at once
+        """
+        state = self.states[population]
+        start = self.metrics.clock()
+        alive = state.alive()
+        state.decrase_health(alive)
+        # generate corpses at the positions where individuals died
+        for slot in np.flatnonzero(alive & (state.health <= 0.0)):
+            i = state.members[slot]
+            self.spawn_item("corpse", Corpse,
+                            i.poison,
+                            position=np.copy(i._position),
+                            corpse_image=i.corpse_image)
+            i.dead = True
+        alive = state.alive()
+        # check if all individuals are dead
+        if not alive.any():
+            self.metrics.record('health', start)
+            self.result = self.end_game()
+            return
+        slots = np.flatnonzero(alive)
+        seekers = [state.members[slot] for slot in slots]
+        for i in seekers:
+            # it survived a frame longer
+            i.increment_survived_time()
+        start = self.metrics.record('health', start)
+        queries = self.population_queries(opponent)
+        visible = self.query_visible(seekers, queries)
+        # closest object per individual and type
+        targets = np.zeros((len(seekers), len(queries), 2))
+        found = np.zeros((len(seekers), len(queries)), dtype=bool)
+        # velocity of every individual when the type was seeked
+        # (attacking an opponent slows an individual down)
+        velocities = np.zeros((len(seekers), len(queries), 2))
+        # one object type after another, as items of one type
+        # only compete with items of the same type
+        for k, (type, perception, eat_callback, _) in enumerate(queries):
+            for n, (i, seen) in enumerate(zip(seekers, visible)):
+                closest = i.closest_object(self.game_objects,
+                                           type,
+                                           perception,
+                                           getattr(i, eat_callback) if eat_callback else None,
+                                           seen)
+                if closest is not None:
+                    found[n, k] = True
+                    targets[n, k] = closest[0]._position
+            velocities[:, k] = state.velocity[slots]
+        # steering forces of all desires (same order as in Individual.seek)
+        inverse = np.array([query[3] for query in queries])
+        forces = steering.desire_forces(state.position[slots],
+                                        velocities,
+                                        targets,
+                                        state.traits[slots, DESIRES],
+                                        inverse,
+                                        state.max_speed[slots],
+                                        state.max_force[slots])
+        acceleration = state.acceleration[slots]
+        steering.apply_desire_forces(acceleration,
+                                     forces,
+                                     found,
+                                     state.velocity[slots],
+                                     state.max_force[slots])
+        state.acceleration[slots] = acceleration
+        start = self.metrics.record('seek', start)
+        # apply the boundary force to stay in game area
+        state.stay_in_boundaries(alive,
+                                 self.border_width,
+                                 self.params.frame_width,
+                                 self.params.frame_height)
+        start = self.metrics.record('boundaries', start)
+        # apply acceleration to velocity for all living individuals
+        state.update(alive)
+        for slot in np.flatnonzero(alive):
+            self.game_objects[population].move(state.members[slot])
+        self.metrics.record('integration', start)
+
+
+    def population_queries(self, opponent):
+        """
+        object types seeked by population individuals in the order of Individual.seek
+        (type, perception, eat callback, dodged)
+        """
+        return [("food", "food", "eat_food", False),
+                ("poison", "poison", "eat_poison", True),
+                ("health_potion", "health_potion", "drink_potion", False),
+                (opponent, "opponent", "attack_opponent", False),
+                ("corpse", "corpse", "eat_corpse", False),
+                ("predators", "predator", None, True)]
+
+
+    def predator_queries(self):
+        """
+        object types seeked by predators in the order of Predator.seek_populations
+        (type, perception, eat callback, dodged)
+        """
+        return [("pop1", "opponent", "attack_opponent", False),
+                ("pop2", "opponent", "attack_opponent", False),
+                ("corpse", "corpse", "eat_corpse", False)]
+
+
+    def query_visible(self, seekers, queries):
+        """
+        one batched visibility query per object type for all seekers
+        returns a dict type -> visible objects for every seeker
+        """
+        visible = [{} for _ in seekers]
+        if len(seekers) == 0:
+            return visible
+        positions = np.array([i._position for i in seekers])
+        for type, perception, _, _ in queries:
+            radii = np.array([i.perception_radius(perception)
+                              for i in seekers])
+            for seen, objects in zip(visible,
+                                     query_visible(positions, radii, self.game_objects[type])):
+                seen[type] = objects
+        return visible
+
+
     def end_game(self):
         # stop the update timer
         self.parent.stop_timer()
@@ -250,58 +511,66 @@ class EGame:
         """
         update all predators
         """
-        for i in predators:
+        # health and corpses of all predators first (as in update_predators_arrays),
+        # so every predator sees the corpses of the ones which starved in this frame
+        for i in list(predators):
             # predators also die in time if they don't eat
             i.decrase_health()
             if i.health <= 0.0:
                 # and they spawn a corpse
-                self.game_objects["corpse"].append(Corpse(self.parent,
-                                                             self.border_width,
-                                                             i.poison,
-                                                             position=i._position,
-                                                             corpse_image=i.corpse_image))
+                self.spawn_item("corpse", Corpse,
+                                i.poison,
+                                position=np.copy(i._position),
+                                corpse_image=i.corpse_image)
                 predators.remove(i)
-                continue
+        visible = [None] * len(predators)
+        if self.batched_queries:
+            visible = self.query_visible(list(predators), self.predator_queries())
+        for i, seen in zip(list(predators), visible):
             # they only are interested in seeking individuals of all populations
             # and corpses
-            i.seek_populations(self.game_objects, ["pop1", "pop2"])
+            i.seek_populations(self.game_objects, ["pop1", "pop2"], seen)
             # apply the boundary force to stay in game area
             i.stay_in_boundaries(self.border_width)
             # apply acceleration to velocity
             i.update()
+            predators.move(i)
     
     
-    def draw(self, painter):
-        """
-        draw all game elements on the frame
-        """
-        if not self.parent.parent_window.fastmode:
-            self.draw_border(painter)
-            for f in self.game_objects['food']:
-                f.draw(painter)
-            for p in self.game_objects['poison']:
-                p.draw(painter)
-            for p in self.game_objects['pop1']:
-                if not p.dead:
-                    p.draw(painter)
-            for p in self.game_objects['pop2']:
-                if not p.dead:
-                    p.draw(painter)
-            for h in self.game_objects['health_potion']:
-                h.draw(painter)
-            for c in self.game_objects['corpse']:
-                c.draw(painter)
-            for p in self.game_objects['predators']:
-                p.draw(painter)
-
-    
-    def draw_border(self, painter):
-        """draw the inner field where objects are repelled on"""
-        # but only if the respective debug setting is enabled
-        if self.parent.parent_window.debug['repell_frame']:
-            color = QColor(0, 0, 0, 0)
-            w = self.parent.frameGeometry().width()
-            h = self.parent.frameGeometry().height()
-            position = [w - 2 * self.border_width, h - 2 * self.border_width]
-            painter.setBrush(color)
-            painter.drawRect(self.border_width, self.border_width, position[0], position[1])
+    def update_predators_arrays(self):
+        """
+        update all predators with the array engine
+        """
+        state = self.states['predators']
+        if len(state) == 0:
+            return
+        everyone = state.alive()
+        state.decrase_health(everyone)
+        starved = state.health <= 0.0
+        if starved.any():
+            for slot in np.flatnonzero(starved):
+                i = state.members[slot]
+                # and they spawn a corpse
+                self.spawn_item("corpse", Corpse,
+                                i.poison,
+                                position=np.copy(i._position),
+                                corpse_image=i.corpse_image)
+                self.game_objects['predators'].remove(i)
+            self.bind_state('predators')
+            state = self.states['predators']
+            everyone = state.alive()
+        visible = [None] * len(state)
+        if self.batched_queries:
+            visible = self.query_visible(state.members, self.predator_queries())
+        for i, seen in zip(state.members, visible):
+            # they only are interested in seeking individuals of all populations
+            # and corpses
+            i.seek_populations(self.game_objects, ["pop1", "pop2"], seen)
+        # apply the boundary force to stay in game area
+        state.stay_in_boundaries(everyone,
+                                 self.border_width,
+                                 self.params.frame_width,
+                                 self.params.frame_height)
+        state.update(everyone)
+        for i in state.members:
+            self.game_objects['predators'].move(i)
@@ -2,11 +2,12 @@ import numpy as np
 from game.individuals.trait import Trait
 
 class Ability(Trait):
-    def __init__(self, ability_base, config, dna=None, default=False):
-        self.max_dmg_reduce_by_armor = ability_base['armor_dmg_reduce']
-        self.max_speed_increase = ability_base['max_speed_increase']
-        self.max_poison_reduce = ability_base['max_poison_reduce']
-        self.toxicity_max_dmg = ability_base['toxicity_max_dmg']
+    __slots__ = ('ability_base', 'armor_ability', 'speed', 'strength',
+                 'poison_resistance', 'toxicity')
+
+    def __init__(self, ability_base, config, dna=None, default=False, check=True):
+        # the ability base config is shared by all abilities
+        self.ability_base = ability_base
         if dna is None:
             if default:
                 # increased armor controls how much dmg is taken if attacked
@@ -39,13 +40,31 @@ class Ability(Trait):
                 self.toxicity = init_values[4]
         else:
             # check if dna is valid
-            self.check_dna(dna)
+            # dna checked beforehand (e.g. a whole genome matrix) is not checked again
+            if check:
+                self.check_dna(dna)
             self.armor_ability = dna[0]
             self.speed = dna[1]
             self.strength = dna[2]
             self.poison_resistance = dna[3]
             self.toxicity = dna[4]
 
+    @property
+    def max_dmg_reduce_by_armor(self):
+        return self.ability_base['armor_dmg_reduce']
+
+    @property
+    def max_speed_increase(self):
+        return self.ability_base['max_speed_increase']
+
+    @property
+    def max_poison_reduce(self):
+        return self.ability_base['max_poison_reduce']
+
+    @property
+    def toxicity_max_dmg(self):
+        return self.ability_base['toxicity_max_dmg']
+
     def calc_dmg_dealt_by_toxicity(self):
         """
         calculates the dmg dealt to attacker based on own toxicity
@@ -2,7 +2,10 @@ import numpy as np
 from game.individuals.trait import Trait
 
 class Desires(Trait):
-    def __init__(self, config, dna=None, default=False):
+    __slots__ = ('absolute', 'seek_food', 'dodge_poison', 'seek_potion',
+                 'seek_opponents', 'seek_corpse', 'dodge_predators')
+
+    def __init__(self, config, dna=None, default=False, check=True):
         self.absolute = config['absolute']
         if dna is None:
             if default:
@@ -24,7 +27,9 @@ class Desires(Trait):
                 self.seek_corpse = init_values[4]
                 self.dodge_predators = init_values[5]
         else:
-            self.check_dna(dna)
+            # dna checked beforehand (e.g. a whole genome matrix) is not checked again
+            if check:
+                self.check_dna(dna)
             self.seek_food       = dna[0]
             self.dodge_poison    = dna[1]
             self.seek_potion     = dna[2]
@@ -2,12 +2,13 @@ from game.individuals.individual import Individual
 from game.individuals.perception import Perception
 from game.individuals.desires import Desires
 from game.individuals.ability import Ability
-from PyQt5.QtWidgets import QTableWidgetItem
-from PyQt5.QtGui import QImage, QPixmap
-from PyQt5.QtCore import QPointF
+from game.individuals.genome import genome_to_dna
 import numpy as np
 
 class Dot(Individual):
+    # armor, toxicity and poison resistance derived from the abilities
+    __slots__ = ('_dead_row', 'armor_factor', 'toxic_damage', 'poison_factor')
+
     def __init__(self,
                  parent_canvas,
                  dna=None,
@@ -16,10 +17,16 @@ class Dot(Individual):
                  color=None,
                  abilities=None,
                  desires=None,
-                 perception=None):
+                 perception=None,
+                 genome=None,
+                 check=True):
         # an individual has perceptions, desires and abilities
+        self._dead_row = np.zeros(1, dtype=bool)
         Individual.__init__(self, parent_canvas, color, radius, position)
-        if dna is None:
+        if genome is not None:
+            # a row of a genome matrix (see game.individuals.genome)
+            self.set_genome(genome, check)
+        elif dna is None:
             if perception is None:
                 self.perception = Perception(self.individual_config['default_perception'],
                                              default=self.individual_config['use_default_perception'])
@@ -39,68 +46,55 @@ class Dot(Individual):
         else:
             self.dna_to_traits(dna)
         self.dead = False
+        # paths of the animation images, they are loaded by the renderer
         if self.color[1] == "blue":
-            self.image = [QImage(self.individual_config['image1_pop1']),
-                          QImage(self.individual_config['image2_pop1'])]
-            self.corpse_image = QImage(self.individual_config['corpse_image1'])
+            self.image = self.params.pop1_images
+            self.corpse_image = self.individual_config['corpse_image1']
         elif self.color[1] == "yellow":
-            self.image = [QImage(self.individual_config['image1_pop2']),
-                          QImage(self.individual_config['image2_pop2'])]
-            self.corpse_image = QImage(self.individual_config['corpse_image2'])
+            self.image = self.params.pop2_images
+            self.corpse_image = self.individual_config['corpse_image2']
         self.set_image()
+        self.derive_traits()
 
-    def add_attack_count(self, individual):
+    @property
+    def dead(self):
+        return bool(self._dead_row[0])
+
+    @dead.setter
+    def dead(self, value):
+        self._dead_row[0] = value
+
+    def bind_state(self, state, slot):
         """
-        increment the hit counter for the attacked enemy
+        additionally bind the dead flag to the given slot
         """
-        individual.statistic.attacked_by_opponents += 1
+        Individual.bind_state(self, state, slot)
+        state.dead[slot] = self._dead_row[0]
+        self._dead_row = state.dead[slot:slot + 1]
 
-    def statistic_to_table(self, table_widget, index):
+    def derive_traits(self):
         """
-        print individual information to the statistic window
+        additionally cache the values derived from the abilities
         """
-        # setItem(row, column, item)
-
-        table_widget.setItem(0, index, QTableWidgetItem(str(self.dead)))
-        table_widget.setItem(1, index, QTableWidgetItem(str(self.statistic.time_survived)))
+        Individual.derive_traits(self)
+        # received damage = damage * armor_factor
+        self.armor_factor = self.abilities.calc_dmg_on_armor(1)
+        self.toxic_damage = self.abilities.calc_dmg_dealt_by_toxicity()
+        # health decrease per frame = frame_health_reduce * poison * poison_factor
+        self.poison_factor = self.abilities.calc_poison_reduce(1)
 
-        #perception
-        table_widget.setItem(2, index, QTableWidgetItem(str(self.perception.food)))
-        table_widget.setItem(3, index, QTableWidgetItem(str(self.perception.poison)))
-        table_widget.setItem(4, index, QTableWidgetItem(str(self.perception.health_potion)))
-        table_widget.setItem(5, index, QTableWidgetItem(str(self.perception.corpse)))
-        table_widget.setItem(6, index, QTableWidgetItem(str(self.perception.opponent)))
-        table_widget.setItem(7, index, QTableWidgetItem(str(self.perception.predator)))
-
-        # #desires
-        table_widget.setItem(8, index, QTableWidgetItem(str(self.desires.seek_food)))
-        table_widget.setItem(9, index, QTableWidgetItem(str(self.desires.dodge_poison)))
-        table_widget.setItem(10, index, QTableWidgetItem(str(self.desires.seek_potion)))
-        table_widget.setItem(11, index, QTableWidgetItem(str(self.desires.seek_opponents)))
-        table_widget.setItem(12, index, QTableWidgetItem(str(self.desires.seek_corpse)))
-        table_widget.setItem(13, index, QTableWidgetItem(str(self.desires.dodge_predators)))
-
-        # #abilities
-        table_widget.setItem(14, index, QTableWidgetItem(str(self.abilities.armor_ability)))
-        table_widget.setItem(15, index, QTableWidgetItem(str(self.abilities.speed)))
-        table_widget.setItem(16, index, QTableWidgetItem(str(self.abilities.poison_resistance)))
-        table_widget.setItem(17, index, QTableWidgetItem(str(self.abilities.strength)))
-        table_widget.setItem(18, index, QTableWidgetItem(str(self.abilities.toxicity)))
+    def detach_state(self):
+        """
+        additionally copy the dead flag
+        """
+        Individual.detach_state(self)
+        self._dead_row = self._dead_row.copy()
 
-        # #statistics
-        table_widget.setItem(19, index, QTableWidgetItem(str(self.statistic.food_eaten)))
-        table_widget.setItem(20, index, QTableWidgetItem(str(self.statistic.poison_eaten)))
-        table_widget.setItem(21, index, QTableWidgetItem(str(self.statistic.consumed_potions)))
-        table_widget.setItem(22, index, QTableWidgetItem(str(self.statistic.consumed_corpses)))
-        table_widget.setItem(23, index, QTableWidgetItem(str(self.statistic.enemies_attacked)))
-        table_widget.setItem(24, index, QTableWidgetItem(str(self.statistic.attacked_by_opponents)))
-        table_widget.setItem(25, index, QTableWidgetItem(str(self.statistic.attacked_by_predators)))
-        table_widget.setItem(26, index, QTableWidgetItem(str(self.statistic.food_seen)))
-        table_widget.setItem(27, index, QTableWidgetItem(str(self.statistic.poison_seen)))
-        table_widget.setItem(28, index, QTableWidgetItem(str(self.statistic.potions_seen)))
-        table_widget.setItem(29, index, QTableWidgetItem(str(self.statistic.opponents_seen)))
-        table_widget.setItem(30, index, QTableWidgetItem(str(self.statistic.predators_seen)))
-        table_widget.setItem(31, index, QTableWidgetItem(str(self.statistic.corpses_seen)))
+    def add_attack_count(self, individual):
+        """
+        increment the hit counter for the attacked enemy
+        """
+        individual.statistic.attacked_by_opponents += 1
 
     def print_all_details(self):
         print("is dead", self.dead)
@@ -119,13 +113,20 @@ class Dot(Individual):
         """
         return self.abilities.calc_dmg_with_strength(1, self.default_dmg)
 
+    def health_reduce_per_poison(self):
+        """
+        health decrease per frame and poison unit
+        reduced by the poison resistance ability
+        """
+        return self.params.frame_health_reduce * self.poison_factor
+
     def decrase_health(self):
         """
         decrease own health if called
         the amount is increased by own poisoning
         """
-        self.health -= self.individual_config['frame_health_reduce'] \
-            * self.abilities.calc_poison_reduce(self.poison)
+        self.health -= self.params.frame_health_reduce \
+            * (self.poison * self.poison_factor)
 
     def get_dna(self):
         """
@@ -141,13 +142,30 @@ class Dot(Individual):
         ]
         return dna
     
-    def dna_to_traits(self, dna):
+    def dna_to_traits(self, dna, check=True):
         """
         sets the dna of the individual
         """
         self.perception = Perception(
-            self.individual_config['default_perception'], dna[0])
+            self.individual_config['default_perception'], dna[0], check=check)
         self.desires = Desires(
-            self.individual_config['default_desires'], dna[1])
+            self.individual_config['default_desires'], dna[1], check=check)
         self.abilities = Ability(self.ability_base,
-            self.individual_config['default_abilities'], dna[2])
+            self.individual_config['default_abilities'], dna[2], check=check)
+        self.derive_traits()
+
+    @property
+    def genome(self):
+        """
+        the dna of this individual as one array of 17 floats
+        perception (6) | desires (6) | abilities (5)
+        """
+        return np.array(self.perception.get_dna()
+                        + self.desires.get_dna()
+                        + self.abilities.get_dna())
+
+    def set_genome(self, genome, check=True):
+        """
+        sets the dna of the individual from a genome row
+        """
+        self.dna_to_traits(genome_to_dna(genome), check)
@@ -0,0 +1,88 @@
+import numpy as np
+from game.individuals.invalid_dna_exception import InvalidDNAException
+
+# a genome is the dna of a dot as one row of 17 floats
+# perception (6) | desires (6) | abilities (5)
+# every block sums up to 1.0 (see Trait.check_dna)
+PERCEPTION = slice(0, 6)
+DESIRES = slice(6, 12)
+ABILITIES = slice(12, 17)
+BLOCKS = (PERCEPTION, DESIRES, ABILITIES)
+GENOME_LENGTH = 17
+
+# name of every column, in the order of the get_dna lists
+COLUMNS = (
+    # perception
+    'food', 'poison', 'health_potion', 'opponent', 'corpse', 'predator',
+    # desires
+    'seek_food', 'dodge_poison', 'seek_potion', 'seek_opponents', 'seek_corpse', 'dodge_predators',
+    # abilities
+    'armor_ability', 'speed', 'strength', 'poison_resistance', 'toxicity',
+)
+COLUMN = {name: column for column, name in enumerate(COLUMNS)}
+
+
+def genome_matrix(population):
+    """
+    the genomes of all individuals of a population as a (n, 17) array
+    row i is the genome of population[i]
+    """
+    genomes = np.empty((len(population), GENOME_LENGTH))
+    for row, individual in enumerate(population):
+        genomes[row] = individual.genome
+    return genomes
+
+
+def dna_to_genome(dna):
+    """
+    [perception, desires, abilities] lists (see Dot.get_dna) to a genome row
+    """
+    return np.concatenate([np.asarray(block, dtype=float) for block in dna])
+
+
+def genome_to_dna(genome):
+    """
+    genome row to [perception, desires, abilities] lists (see Dot.dna_to_traits)
+    the genes stay numpy floats like the ones of randomly initialized traits
+    """
+    return [list(genome[block]) for block in BLOCKS]
+
+
+def invalid_genomes(genomes, eps=1e-5):
+    """
+    boolean mask of the rows of a (n, 17) array which are no valid dna
+    (a block does not sum up to 1.0 or a value is negative)
+    """
+    genomes = np.atleast_2d(genomes)
+    invalid = (genomes < 0).any(axis=1)
+    for block in BLOCKS:
+        invalid |= np.abs(1 - genomes[:, block].sum(axis=1)) > eps
+    return invalid
+
+
+def check_genomes(genomes):
+    """
+    raise an InvalidDNAException for the first invalid row
+    """
+    invalid = np.flatnonzero(invalid_genomes(genomes))
+    if len(invalid) > 0:
+        row = np.atleast_2d(genomes)[invalid[0]]
+        raise InvalidDNAException(row, "genome " + str(invalid[0]) + " is no valid DNA!")
+
+
+def create_individuals(parent, genomes, color, positions=None):
+    """
+    create one dot per row of the genomes
+    the genomes are checked at once, not per dot and trait
+    positions is a sequence of positions (or None for random positions)
+    """
+    # imported here, dot imports this module
+    from game.individuals.dot import Dot
+    genomes = np.atleast_2d(np.asarray(genomes, dtype=float))
+    check_genomes(genomes)
+    individuals = []
+    for row, genome in enumerate(genomes):
+        position = None if positions is None else positions[row]
+        individuals.append(Dot(parent, color=color, position=position,
+                               genome=genome, check=False))
+    return individuals
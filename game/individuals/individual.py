@@ -1,33 +1,56 @@
 import numpy as np
 import math
 import abc
+import copy
+import itertools
 from random import randint, uniform
-from PyQt5.QtGui import QColor, QTransform, QPixmap, QImage
-from PyQt5.QtCore import QPoint, QPointF, Qt
 from game.individuals.perception import Perception
 from game.individuals.desires import Desires
 from game.individuals.ability import Ability
 from game.individuals.statistic import Statistic
 
+# unique id of every individual, used to remember what was seen without keeping references
+uids = itertools.count()
+# version of the traits, a new number whenever the traits of an individual change
+dna_versions = itertools.count()
+
 class Individual(metaclass=abc.ABCMeta):
+    # the config is not copied into every individual,
+    # it is read through the parent which is shared by all of them
+    __slots__ = ('parent', 'perception', 'desires', 'abilities',
+                 '_position_row', '_velocity_row', '_acceleration_row',
+                 '_health_row', '_poison_row',
+                 'statistic', 'max_health', 'color', 'default_dmg', 'radius',
+                 'max_speed', 'max_force', 'uid', 'last_tick_seen',
+                 # frozen config parameters and values derived from the traits
+                 'params', 'own_max_speed', 'radii', 'damage', 'dna_version',
+                 # image paths (shared) and the index of the shown animation frame
+                 'image', 'display_frame', 'corpse_image')
+
     def __init__(self, parent, color, radius=None, position=None):
         self.parent = parent
+        self.uid = next(uids)
+        self.params = self.parent.config.params
         self.perception = None
         self.desires = None
         self.abilities = None
-        # config parameter
-        self.config = self.parent.config
-        self.individual_config = self.config.individuals
-        self.predator_config = self.config.predators
-        self.ability_base = self.config.ability_base
         
+        # position, velocity, acceleration, health and poison live in rows
+        # which are either owned by the individual itself
+        # or are views into the arrays of a PopulationState (see bind_state)
+        self._position_row = np.zeros(2)
+        self._velocity_row = np.zeros(2)
+        self._acceleration_row = np.zeros(2)
+        self._health_row = np.zeros(1)
+        self._poison_row = np.zeros(1)
+
         # standard parameter
         self.statistic = Statistic()
-        self.max_health = self.individual_config['max_health']
+        self.max_health = self.params.max_health
         self.health = self.max_health
-        self.poison = self.individual_config['start_poison']
+        self.poison = self.params.start_poison
         self.color = color
-        self.default_dmg = self.individual_config['default_dmg']
+        self.default_dmg = self.params.default_dmg
 
         # if a position was not given
         if position is None:
@@ -42,23 +65,160 @@ class Individual(metaclass=abc.ABCMeta):
             self._position = np.array([position[0], position[1]])
         # if a radius was given
         if not radius:
-            self.radius = self.individual_config['start_size']
+            self.radius = self.params.start_size
         else:
             self.radius = radius
         # let the individuals run in random directions at beginning
         self.acceleration = np.array([0.0, 0.0])
         self.velocity = np.array([uniform(-0.5, 0.5), uniform(-0.5, 0.5)])
-        self.max_speed = self.individual_config['max_speed']
-        self.max_force = self.individual_config['max_force']
+        self.max_speed = self.params.max_speed
+        self.max_force = self.params.max_force
         # should the default config be used?
 
+        # type -> set of the uids seen in the last frame
         self.last_tick_seen = {}
 
+    @property
+    def config(self):
+        return self.parent.config
+
+    @property
+    def individual_config(self):
+        return self.parent.config.individuals
+
+    @property
+    def predator_config(self):
+        return self.parent.config.predators
+
+    @property
+    def ability_base(self):
+        return self.parent.config.ability_base
+
+    @property
+    def _position(self):
+        return self._position_row
+
+    @_position.setter
+    def _position(self, value):
+        self._position_row[:] = value
+
+    @property
+    def velocity(self):
+        return self._velocity_row
+
+    @velocity.setter
+    def velocity(self, value):
+        self._velocity_row[:] = value
+
+    @property
+    def acceleration(self):
+        return self._acceleration_row
+
+    @acceleration.setter
+    def acceleration(self, value):
+        self._acceleration_row[:] = value
+
+    @property
+    def health(self):
+        return float(self._health_row[0])
+
+    @health.setter
+    def health(self, value):
+        self._health_row[0] = value
+
+    @property
+    def poison(self):
+        return float(self._poison_row[0])
+
+    @poison.setter
+    def poison(self, value):
+        self._poison_row[0] = value
+
+    def bind_state(self, state, slot):
+        """
+        move own values into the given slot of a PopulationState
+        afterwards the individual is a view on that row
+        """
+        state.position[slot] = self._position_row
+        state.velocity[slot] = self._velocity_row
+        state.acceleration[slot] = self._acceleration_row
+        state.health[slot] = self._health_row[0]
+        state.poison[slot] = self._poison_row[0]
+        self._position_row = state.position[slot]
+        self._velocity_row = state.velocity[slot]
+        self._acceleration_row = state.acceleration[slot]
+        self._health_row = state.health[slot:slot + 1]
+        self._poison_row = state.poison[slot:slot + 1]
+
+    def detach_state(self):
+        """
+        give the individual own copies of its rows
+        afterwards it is no longer a view on a PopulationState
+        """
+        self._position_row = self._position_row.copy()
+        self._velocity_row = self._velocity_row.copy()
+        self._acceleration_row = self._acceleration_row.copy()
+        self._health_row = self._health_row.copy()
+        self._poison_row = self._poison_row.copy()
+
+    def __copy__(self):
+        """
+        shallow copy (copy.copy) with own rows, so changing the position
+        or health of the copy does not change the original
+        """
+        clone = object.__new__(type(self))
+        for klass in type(self).__mro__:
+            for name in klass.__dict__.get('__slots__', ()):
+                if hasattr(self, name):
+                    setattr(clone, name, getattr(self, name))
+        # subclasses of the breeders may have no slots
+        if hasattr(self, '__dict__'):
+            clone.__dict__.update(self.__dict__)
+        clone.detach_state()
+        return clone
+
+    def snapshot(self):
+        """
+        copy of the individual which keeps its current state
+        (traits are shared, they are replaced but never changed)
+        """
+        clone = copy.copy(self)
+        clone.statistic = copy.copy(self.statistic)
+        clone.last_tick_seen = {}
+        return clone
+
+    def derive_traits(self):
+        """
+        cache the values which are derived from the traits
+        has to be called whenever the traits, radius or max speed changed
+        """
+        # fitness caches of the breeders are keyed by this version
+        self.dna_version = next(dna_versions)
+        if self.abilities is not None:
+            self.own_max_speed = self.abilities.calc_max_speed(self.max_speed)
+        else:
+            self.own_max_speed = self.max_speed
+        # perception radius in pixel per perception, at least the own radius
+        self.radii = {}
+        for perception in ['food', 'poison', 'health_potion', 'opponent', 'corpse', 'predator']:
+            p = self.perception.absolute(getattr(self.perception, perception))
+            if p < self.radius:
+                p = self.radius
+            self.radii[perception] = p
+        self.damage = self.dmg_dealt()
+
     def set_image(self):
         """
         initial image set
         """
-        self.display_image = self.image[0]
+        self.display_frame = 0
+
+    @property
+    def display_image(self):
+        """
+        path of the image which is currently displayed
+        """
+        return self.image[self.display_frame]
 
 
     def update(self):
@@ -81,44 +241,52 @@ class Individual(metaclass=abc.ABCMeta):
         self.acceleration = self.limit(self.acceleration, self.max_force)
 
 
-    def seek(self, game_objects, seek_pop):
+    def seek(self, game_objects, seek_pop, visible=None):
         """
         calculate the steering vector
         and apply it to the object
+        visible optionally holds the visible objects per type
+        which were already queried for the whole frame
         """
         forces = []
         forces.append(self.seek_object(game_objects,
                                        "food",
-                                       self.perception.food,
+                                       "food",
                                        self.eat_food,
-                                       self.desires.seek_food))
+                                       self.desires.seek_food,
+                                       visible=visible))
         forces.append(self.seek_object(game_objects,
                                        "poison",
-                                       self.perception.poison,
+                                       "poison",
                                        self.eat_poison,
                                        self.desires.dodge_poison,
-                                       inverse=True))
+                                       inverse=True,
+                                       visible=visible))
         forces.append(self.seek_object(game_objects,
                                        "health_potion",
-                                       self.perception.health_potion,
+                                       "health_potion",
                                        self.drink_potion,
-                                       self.desires.seek_potion))
+                                       self.desires.seek_potion,
+                                       visible=visible))
         forces.append(self.seek_object(game_objects,
                                        seek_pop,
-                                       self.perception.opponent,
+                                       "opponent",
                                        self.attack_opponent,
-                                       self.desires.seek_opponents))
+                                       self.desires.seek_opponents,
+                                       visible=visible))
         forces.append(self.seek_object(game_objects,
                                        "corpse",
-                                       self.perception.corpse,
+                                       "corpse",
                                        self.eat_corpse,
-                                       self.desires.seek_corpse))
+                                       self.desires.seek_corpse,
+                                       visible=visible))
         forces.append(self.seek_object(game_objects,
                                        "predators",
-                                       self.perception.predator,
+                                       "predator",
                                        None,
                                        self.desires.dodge_predators,
-                                       inverse=True))
+                                       inverse=True,
+                                       visible=visible))
         
         for force in forces:
             if force is not None:
@@ -138,44 +306,70 @@ class Individual(metaclass=abc.ABCMeta):
                     perception,
                     eat_callback,
                     desire,
-                    inverse=False):
+                    inverse=False,
+                    visible=None):
         """
         calculates the force for a given type
-        under restriction of the given perception percentage
+        under restriction of the perception with the given name
         and given desire
         if the distance to the next object is covered by own radius
         the element gets eaten if an eat_callback is given
         """
-        # get all visible object of the given type
-        visible_objects = self.get_visible_objects(
-            game_objects, type, perception)
-        # set the current visible objects of the given type for statistics
+        closest = self.closest_object(game_objects,
+                                      type,
+                                      perception,
+                                      eat_callback,
+                                      visible)
+        if closest is None:
+            return None
+        # return steering force
+        return self.calc_force(closest, desire, inverse)
+
+
+    def closest_object(self,
+                       game_objects,
+                       type,
+                       perception,
+                       eat_callback,
+                       visible=None):
+        """
+        get the closest visible (element, distance) of a given type or None
+        updates the seen statistics and calls the eat_callback on the closest
+        """
+        if visible is None:
+            # get all visible object of the given type
+            visible_objects = self.get_visible_objects(
+                game_objects, type, perception)
+        else:
+            # use the objects queried for the whole frame
+            # but skip the ones which were eaten in the meantime
+            objects = game_objects[type]
+            visible_objects = [v for v in visible[type] if v[0] in objects]
+        # set the uids of the current visible objects of the given type for statistics
         # keep in mind: visible objects contains tuples as elements
-        seen = []
-        for element, _ in visible_objects:
-            seen.append(element)
+        seen = {element.uid for element, _ in visible_objects}
+        # count the visible objects which were not seen in the last tick
+        # (nothing is counted in the first tick an individual looks for the type)
+        last_seen = self.last_tick_seen.get(type)
+        if last_seen is not None:
+            new = len(seen - last_seen)
+            if new:
+                self.statistic.increment(type, new)
+        # set the current visible items to be checked in next frame
+        self.last_tick_seen[type] = seen
         # if we see at least one item
         if len(visible_objects) > 0:
-            # iterate over all visible items
-            for e in seen:
-                # if there is a list for the type and the visible item was not seen in last tick
-                if type in self.last_tick_seen and e not in self.last_tick_seen[type]:
-                    # increment the counter for the type
-                    self.statistic.increment(type)
             # sort visible items with increasing distance
-            visible_objects.sort(key=lambda tup: tup[1])
+            # (objects at the same distance, e.g. children bred at the same position,
+            # by uid, so the closest does not depend on the order of the query)
+            visible_objects.sort(key=lambda tup: (tup[1], tup[0].uid))
             # get the closest
             closest = visible_objects[0]
             # do we have a function to eat?
             if eat_callback is not None:
                 # call that function
                 eat_callback(closest, game_objects)
-            # set the current visible items to be checked in next frame
-            self.last_tick_seen[type] = seen
-            # return steering force
-            return self.calc_force(closest, desire, inverse)
-        # also set current visible items to be checked in next frame
-        self.last_tick_seen[type] = seen
+            return closest
         # return none
         return None
 
@@ -184,8 +378,8 @@ class Individual(metaclass=abc.ABCMeta):
         """
         eat a corpse
         """
-        if element[1] - element[0].size/2 <= self.radius:
-            self.increase_health(element[0].nutrition)
+        if element[1] - element[0].kind.radius <= self.radius:
+            self.increase_health(element[0].kind.nutrition)
             self.poison += int(1.0/3.0 * element[0].poison)
             game_objects["corpse"].remove(element[0])
             self.statistic.consumed_corpses += 1
@@ -195,7 +389,7 @@ class Individual(metaclass=abc.ABCMeta):
         """
         drink a potion
         """
-        if element[1] - element[0].size/2 <= self.radius:
+        if element[1] - element[0].kind.radius <= self.radius:
             self.poison = 1
             self.increase_health(0.1)
             game_objects["health_potion"].remove(element[0])
@@ -206,7 +400,7 @@ class Individual(metaclass=abc.ABCMeta):
         """
         eat poison
         """
-        if element[1] - element[0].size/2 <= self.radius:
+        if element[1] - element[0].kind.radius <= self.radius:
             self.poison += 1
             game_objects["poison"].remove(element[0])
             self.statistic.poison_eaten += 1
@@ -216,8 +410,8 @@ class Individual(metaclass=abc.ABCMeta):
         """
         eat some food
         """
-        if element[1] - element[0].size/2 <= self.radius:
-            self.increase_health(element[0].nutrition)
+        if element[1] - element[0].kind.radius <= self.radius:
+            self.increase_health(element[0].kind.nutrition)
             game_objects["food"].remove(element[0])
             self.statistic.food_eaten += 1
 
@@ -230,13 +424,13 @@ class Individual(metaclass=abc.ABCMeta):
         distance = self.dist(element[0]._position, attack_pos)
         if distance <= element[0].radius:
             # calc dmg with strength ability
-            dmg = self.dmg_dealt()
+            dmg = self.damage
             # deal dmg to element[0]
-            dmg_dealt = element[0].abilities.calc_dmg_on_armor(dmg)
+            dmg_dealt = dmg * element[0].armor_factor
             element[0].health -= dmg_dealt
 
             # is the opponent toxic? deal its toxicity dmg
-            receive_dmg = element[0].abilities.calc_dmg_dealt_by_toxicity()
+            receive_dmg = element[0].toxic_damage
             self.health -= receive_dmg
 
             # repell self a little in opposite direction
@@ -278,6 +472,15 @@ class Individual(metaclass=abc.ABCMeta):
         return steer
 
 
+    @abc.abstractmethod
+    def health_reduce_per_poison(self):
+        """
+        abstract method for the health decrease per frame and poison unit
+        used by the array engine to decrease health of a whole population
+        """
+        pass
+
+
     @abc.abstractmethod
     def decrase_health(self):
         """
@@ -304,8 +507,8 @@ class Individual(metaclass=abc.ABCMeta):
         """
         desired = None
 
-        w = self.parent.frameGeometry().width()
-        h = self.parent.frameGeometry().height()
+        w = self.params.frame_width
+        h = self.params.frame_height
 
         if self._position[0] < boundary:
             desired = self.create_vector(self.get_own_max_speed(), self.velocity[1])
@@ -325,11 +528,9 @@ class Individual(metaclass=abc.ABCMeta):
     def get_own_max_speed(self):
         """
         wrapper for individuals / predator max speed calculation
+        (cached by derive_traits)
         """
-        if self.abilities is not None:
-            return self.abilities.calc_max_speed(self.max_speed)
-        else:
-            return self.max_speed
+        return self.own_max_speed
 
 
     def create_vector(self, x, y):
@@ -344,13 +545,12 @@ class Individual(metaclass=abc.ABCMeta):
         gets all visible objects in perception radius for a given type
         e.g.:
         type = "food"
-        perception = self.perception.food
+        perception = "food"
         """
         visible = []
-        p = self.perception.absolute(perception)
-        if p < self.radius:
-            p = self.radius
-        for element in game_objects[type]:
+        p = self.perception_radius(perception)
+        # only objects in the neighbouring grid cells can be in range
+        for element in game_objects[type].near(self._position, p):
             d = self.dist(self._position, element._position)
             if d <= p:
                 if hasattr(element, "dead") and element.dead:
@@ -360,6 +560,14 @@ class Individual(metaclass=abc.ABCMeta):
         return visible
 
 
+    def perception_radius(self, perception):
+        """
+        perception radius in pixel for the perception with the given name
+        an individual sees at least its own radius (cached by derive_traits)
+        """
+        return self.radii[perception]
+
+
     def dist(self, p1, p2):
         """
         calculate distance between two points
@@ -413,126 +621,6 @@ class Individual(metaclass=abc.ABCMeta):
         pass
 
 
-    def draw_debug_radius(self, painter, setting, position, color, perception):
-        """
-        draw the perception radius around the individual
-        """
-        if self.parent.parent_window.debug[setting]:
-            # draw perception
-            painter.setPen(QColor(color))
-            painter.setBrush(QColor(0, 0, 0, 0))
-            painter.drawEllipse(position,
-                                self.perception.absolute(
-                                    perception),
-                                self.perception.absolute(perception))
-
-
-    def draw_debug_vector(self, painter, setting, position, color, vector):
-        """
-        draw the given vector on top of the individual
-        """
-        if self.parent.parent_window.debug[setting]:
-            color = QColor(color)
-            target = position + QPoint(vector[0]*100, vector[1]*100)
-            painter.setBrush(color)
-            painter.setPen(QColor("black"))
-            painter.drawLine(position, target)
-
-
-    def draw_debug(self, painter):
-        """
-        draws all debug elements such as vectors and perceptions
-        """
-        self.draw_health(painter)
-        position = QPoint(self._position[0], self._position[1])
-        self.draw_debug_radius(painter,
-                               'food_perception',
-                               position,
-                               'green',
-                               self.perception.food)
-        self.draw_debug_radius(painter,
-                               'poison_perception',
-                               position,
-                               'red',
-                               self.perception.poison)
-        self.draw_debug_radius(painter,
-                               'potion_perception',
-                               position,
-                               'violett',
-                               self.perception.health_potion)
-        self.draw_debug_radius(painter,
-                               'opponent_perception',
-                               position,
-                               'blue',
-                               self.perception.opponent)
-        self.draw_debug_radius(painter,
-                               'predator_perception',
-                               position,
-                               'black',
-                               self.perception.predator)
-        self.draw_debug_radius(painter,
-                               'corpse_perception',
-                               position,
-                               'brown',
-                               self.perception.corpse)
-        self.draw_debug_vector(painter,
-                               'velocity_vector',
-                               position,
-                               "black",
-                               self.velocity)
-
-
-    def draw_health(self, painter):
-        """
-        draw health on top of the individual
-        """
-        if self.parent.parent_window.debug['health']:
-            # draw health text
-            if self.health <= 0.2:
-                color = QColor("red")
-            else:
-                color = QColor("black")
-            if self.health >= 0.1:
-                position = QPointF(self._position[0]-8, self._position[1]+4)
-            else:
-                position = QPointF(self._position[0]-4, self._position[1]+4)
-            painter.setBrush(color)
-            painter.setPen(color)
-            if self.health < 1:
-                draw_text = str(int(self.health * 100))
-                painter.drawText(position, draw_text)
-
-
-    def draw(self, painter):
-        """
-        draw the individual
-        """
-        # self.draw_circle(painter)
-        self.draw_image(painter)
-        self.draw_debug(painter)
-
-
-    def draw_image(self, painter):
-        """
-        draw the individual
-        """
-        # rotate the image so that it points to the direction of the velocity
-        vec1 = np.array([0, -1])
-        vec2 = self.velocity
-        angle = math.atan2(vec2[1], vec2[0]) - math.atan2(vec1[1], vec1[0])
-        angle = math.degrees(angle)
-        half_x = self.display_image.width()/2
-        half_y = self.display_image.height()/2
-        pos_x = self._position[0]
-        pos_y = self._position[1]
-
-        painter.save()
-        painter.translate(pos_x, pos_y)
-        painter.rotate(angle)
-        painter.translate(-half_x, -half_y)
-        painter.drawImage(0, 0, self.display_image)
-        painter.restore()
-
     def calc_angle(self, v1, v2, acute):
         """
         get the angle between two vectors in degree
@@ -548,19 +636,4 @@ class Individual(metaclass=abc.ABCMeta):
         """
         swaps the image to be displayed to create an animation
         """
-        if self.display_image == self.image[0]:
-            self.display_image = self.image[1]
-        else:
-            self.display_image = self.image[0]
-
-    def draw_circle(self, painter):
-        """
-        draws a circle at own position with own color
-        """
-        # draw the circle for the individual
-        color = QColor(self.color[0][0], self.color[0][1], self.color[0][2])
-        position = QPoint(self._position[0], self._position[1])
-        painter.setBrush(color)
-        painter.setPen(QColor(0, 0, 0, 0))
-        painter.drawEllipse(position, self.radius, self.radius)
-
+        self.display_frame = (self.display_frame + 1) % len(self.image)
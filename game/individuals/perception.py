@@ -1,7 +1,10 @@
 import numpy as np
 from game.individuals.trait import Trait
 class Perception(Trait):
-    def __init__(self, config, dna=None, default=False):
+    __slots__ = ('absolute_val', 'food', 'poison', 'health_potion',
+                 'opponent', 'corpse', 'predator')
+
+    def __init__(self, config, dna=None, default=False, check=True):
         self.absolute_val = config['absolute']
         if dna is None:
             if default:
@@ -24,7 +27,9 @@ class Perception(Trait):
                 # self.rainbow_drop = init_values[6]
                 # self.aoe = init_values[7]
         else:
-            self.check_dna(dna)
+            # dna checked beforehand (e.g. a whole genome matrix) is not checked again
+            if check:
+                self.check_dna(dna)
             self.food =          dna[0]
             self.poison =        dna[1]
             self.health_potion = dna[2]
@@ -3,9 +3,10 @@ from game.individuals.desires import Desires
 from game.individuals.perception import Perception
 from random import randint, uniform
 import numpy as np
-from PyQt5.QtGui import QImage, QPixmap
 
 class Predator(Individual):
+    __slots__ = ()
+
     def __init__(self,
                  parent,
                  position=None,
@@ -13,19 +14,19 @@ class Predator(Individual):
                  color=None):
         Individual.__init__(self, parent, color, radius, position)
         # a predator is slower than individuals
-        self.max_speed = self.max_speed * self.predator_config["speed_factor"]
+        self.max_speed = self.max_speed * self.params.predator_speed_factor
         # it has perceptions and desires defined in config file
         self.perception = Perception(self.predator_config["default_perception"], default=True)
         self.desires = Desires(self.predator_config["default_desires"], default=True)
-        self.radius = self.predator_config['size']
-        self.image = [QImage(self.predator_config['image1']),
-                      QImage(self.predator_config['image2'])]
-        self.corpse_image = QImage(self.predator_config['corpse_image'])
+        self.radius = self.params.predator_size
+        # paths of the animation images, they are loaded by the renderer
+        self.image = self.params.predator_images
+        self.corpse_image = self.predator_config['corpse_image']
 
 
     
 
-        self.default_dmg = self.predator_config['default_dmg']
+        self.default_dmg = self.params.predator_default_dmg
 
         # we want that the predators spawn outside of the game area        
         _left_border = 0
@@ -46,6 +47,7 @@ class Predator(Individual):
             _y = _yb
         self._position = np.array([_x, _y])
         self.set_image()
+        self.derive_traits()
 
 
     def add_attack_count(self, individual):
@@ -54,25 +56,29 @@ class Predator(Individual):
        """
        individual.statistic.attacked_by_predators += 1
 
-    def seek_populations(self, game_objects, opponents):
+    def seek_populations(self, game_objects, opponents, visible=None):
         """
         seek elements called by predators
+        visible optionally holds the visible objects per type
+        which were already queried for the whole frame
         """
         force_applied = False
         for pop in opponents:
             opponent_force = self.seek_object(game_objects,
                                               pop,
-                                              self.perception.opponent,
+                                              "opponent",
                                               self.attack_opponent,
-                                              self.desires.seek_opponents)
+                                              self.desires.seek_opponents,
+                                              visible=visible)
             if opponent_force is not None:
                 self.apply_force(opponent_force)
                 force_applied = True
         corpse_force = self.seek_object(game_objects,
                                         "corpse",
-                                        self.perception.corpse,
+                                        "corpse",
                                         self.eat_corpse,
-                                        self.desires.seek_corpse)
+                                        self.desires.seek_corpse,
+                                        visible=visible)
         if corpse_force is not None:
             self.apply_force(corpse_force)
             force_applied = True
@@ -90,9 +96,15 @@ class Predator(Individual):
         """
         return self.default_dmg
 
+    def health_reduce_per_poison(self):
+        """
+        health decrease per frame and poison unit
+        """
+        return self.params.frame_health_reduce
+
     def decrase_health(self):
         """
         decrease own health if called
         the amount is increased by own poisoning
         """
-        self.health -= self.individual_config['frame_health_reduce'] * self.poison
+        self.health -= self.params.frame_health_reduce * self.poison
@@ -1,43 +1,95 @@
+import itertools
+import numpy as np
+
+# the counters of a statistic, in the order of the columns of a StatisticTable
+FIELDS = ('time_survived',
+          'food_eaten', 'poison_eaten', 'consumed_potions', 'consumed_corpses',
+          'enemies_attacked', 'attacked_by_opponents', 'attacked_by_predators',
+          'food_seen', 'poison_seen', 'potions_seen', 'opponents_seen',
+          'predators_seen', 'corpses_seen')
+# column index of every counter
+(TIME_SURVIVED,
+ FOOD_EATEN, POISON_EATEN, CONSUMED_POTIONS, CONSUMED_CORPSES,
+ ENEMIES_ATTACKED, ATTACKED_BY_OPPONENTS, ATTACKED_BY_PREDATORS,
+ FOOD_SEEN, POISON_SEEN, POTIONS_SEEN, OPPONENTS_SEEN,
+ PREDATORS_SEEN, CORPSES_SEEN) = range(len(FIELDS))
+# version of the counters, a new number for every statistic before each breeding round
+# (see Statistic.stamp), the counters themselves are written without any bookkeeping
+versions = itertools.count()
+# one record of a StatisticTable
+DTYPE = np.dtype([(name, np.int64) for name in FIELDS])
+
+# column of the seen counter of every type of game object
+SEEN = {
+    'food': FOOD_SEEN,
+    'poison': POISON_SEEN,
+    'health_potion': POTIONS_SEEN,
+    'predators': PREDATORS_SEEN,
+    'corpse': CORPSES_SEEN,
+    'pop1': OPPONENTS_SEEN,
+    'pop2': OPPONENTS_SEEN,
+}
+
+
+def counter(column):
+    """
+    property which reads and writes one column of the row of a statistic
+    """
+    def get(self):
+        return int(self.row[column])
+
+    def set(self, value):
+        self.row[column] = value
+    return property(get, set)
+
 
 class Statistic:
+    """
+    the counters of an individual
+    they are stored in a row which is either owned by the statistic itself
+    or is a view into a StatisticTable of the whole population (see bind)
+    """
+    __slots__ = ('row', 'table', 'slot', 'version')
+
     def __init__(self):
-        # general
-        self.time_survived = 0
-
-        # items
-        self.food_eaten = 0
-        self.poison_eaten = 0
-        self.consumed_potions = 0
-        self.consumed_corpses = 0
-        
-        # competitions
-        self.enemies_attacked = 0
-        self.attacked_by_opponents = 0
-        self.attacked_by_predators = 0
-
-        # perception
-        self.food_seen = 0
-        self.poison_seen = 0
-        self.potions_seen = 0
-        self.opponents_seen = 0
-        self.predators_seen = 0
-        self.corpses_seen = 0
-
-    def increment(self, type):
-        if type == "food":
-            self.food_seen += 1
-        elif type == "poison":
-            self.poison_seen += 1
-        elif type == "health_potion":
-            self.potions_seen += 1
-        elif type == "predators":
-            self.predators_seen += 1
-        elif type == "corpse":
-            self.corpses_seen += 1
-        elif "pop" in type:
-            self.opponents_seen += 1
-        else:
-            raise Exception("statistic increment error! " + type + " not found")
+        # all counters start at 0
+        self.row = np.zeros(len(FIELDS), dtype=np.int64)
+        self.table = None
+        self.slot = None
+        self.version = next(versions)
+
+    def __copy__(self):
+        # a copy keeps the current values but is bound to no table
+        clone = Statistic()
+        clone.row[:] = self.row
+        return clone
+
+    def bind(self, table, slot):
+        """
+        move the counters into the given row of a StatisticTable
+        """
+        table.values[slot] = self.row
+        self.row = table.values[slot]
+        self.table = table
+        self.slot = slot
+
+    def increment(self, type, count=1):
+        """
+        count newly seen objects of the given type
+        """
+        column = SEEN.get(type)
+        if column is None:
+            if "pop" not in type:
+                raise Exception("statistic increment error! " + type + " not found")
+            column = OPPONENTS_SEEN
+        self.row[column] += count
+
+    def stamp(self):
+        """
+        new version for the current counters
+        called once per breeding round by EGame.breed (not on every change of a counter)
+        """
+        self.version = next(versions)
 
     def print(self):
         print("frames survived", self.time_survived)
@@ -53,4 +105,59 @@ class Statistic:
         print("health potions seen", self.potions_seen)
         print("opponents seen", self.opponents_seen)
         print("predators seen", self.predators_seen)
-        print("corpses seen", self.corpses_seen)
\ No newline at end of file
+        print("corpses seen", self.corpses_seen)
+
+
+# statistic.food_eaten, statistic.time_survived, ... read and write their column
+for _column, _name in enumerate(FIELDS):
+    setattr(Statistic, _name, counter(_column))
+
+
+class StatisticTable:
+    """
+    the statistics of a whole population, one row per individual
+    the statistic of every individual is bound to its row,
+    so the table is always up to date without copying
+    """
+    def __init__(self, individuals):
+        self.values = np.zeros((len(individuals), len(FIELDS)), dtype=np.int64)
+        # an individual which is in the list twice is bound to its last slot
+        for slot, individual in enumerate(individuals):
+            individual.statistic.bind(self, slot)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, name):
+        """
+        view of one counter of all individuals, e.g. table['food_eaten']
+        """
+        return self.values[:, FIELDS.index(name)]
+
+    @property
+    def records(self):
+        """
+        view of the table as a structured array, one record per individual
+        """
+        return self.values.view(DTYPE)[:, 0]
+
+
+def statistic_table(population):
+    """
+    the statistics of a list of individuals as a structured array (one record per individual)
+    records['food_eaten'][i] is the food eaten by population[i]
+    zero-copy if the statistics are bound to one table in the order of the list
+    (as for the populations the breeders get), a copy otherwise
+    """
+    if len(population) > 0:
+        table = population[0].statistic.table
+        if (
+            table is not None
+            and len(table) == len(population)
+            and all(individual.statistic.table is table and individual.statistic.slot == slot
+                    for slot, individual in enumerate(population))
+        ):
+            return table.records
+    values = np.array([individual.statistic.row for individual in population],
+                      dtype=np.int64).reshape(len(population), len(FIELDS))
+    return values.view(DTYPE)[:, 0]
@@ -1,6 +1,8 @@
 from game.individuals.invalid_dna_exception import InvalidDNAException
 
 class Trait:
+    __slots__ = ()
+
     def check_dna(self, dna):
         """
         check if the dna is valid
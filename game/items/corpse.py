@@ -1,36 +1,16 @@
 from game.items.game_item import GameItem
-from PyQt5.QtGui import QPainter, QColor, QFont, QBrush, QPen, QPolygonF
-from PyQt5.QtCore import QPointF
 
 class Corpse(GameItem):
+    # path of the image of the dead individual and its poison
+    __slots__ = ('image', 'poison')
+    config_key = "corpse"
+
     def __init__(self, parent, boundary, poison, position, corpse_image):
         GameItem.__init__(self, parent, boundary, position)
-        self.corpse_config = self.items_config['corpse']
-        self.size = self.corpse_config['size']
-        self.color = self.corpse_config['color']
-        self.nutrition = self.corpse_config['nutrition']
         self.image = corpse_image
         self.poison = poison
 
-    def draw(self, painter):
-        if self.image is "":
-            self.draw_polygon(painter)
-        else:
-            self.draw_image(painter)
-
-
-    def draw_polygon(self, painter):
-        color = QColor(self.color)
-        painter.setBrush(color)
-
-        r = self.size/2
-
-        polygon = QPolygonF()
-        polygon.append(QPointF(self._position[0] + r, self._position[1] + r/2))
-        polygon.append(QPointF(self._position[0], self._position[1] + r))
-        polygon.append(QPointF(self._position[0] - r, self._position[1] + r/2))
-        polygon.append(QPointF(self._position[0] - r, self._position[1] - r/2))
-        polygon.append(QPointF(self._position[0], self._position[1] - r))
-        polygon.append(QPointF(self._position[0] + r, self._position[1] - r/2))
-
-        painter.drawPolygon(polygon)
+    def reset(self, boundary, poison, position, corpse_image):
+        self.place(boundary, position)
+        self.image = corpse_image
+        self.poison = poison
@@ -1,15 +1,58 @@
+import itertools
 import numpy as np
 from random import randint
 
-from PyQt5.QtGui import QImage
-from PyQt5.QtCore import QPointF
+# unique id of every placed item, used to remember what was seen without keeping references
+uids = itertools.count()
 
 
 class GameItem():
+    # an item only holds its position, everything else is shared by all
+    # items of a type in the ItemParameters of the compiled config
+    __slots__ = ('parent', '_position', 'uid', 'kind')
+    # key of the item type in the items config
+    config_key = None
+
     def __init__(self, parent, boundary, position=None):
         self.parent = parent
-        self.config = parent.config
-        self.items_config = self.config.items
+        # resolved once, the attributes of the type are read every frame
+        self.kind = parent.config.params.items[self.config_key]
+        self.place(boundary, position)
+
+    @property
+    def config(self):
+        return self.parent.config
+
+    @property
+    def items_config(self):
+        return self.parent.config.items
+
+    @property
+    def item_config(self):
+        return self.parent.config.items[self.config_key]
+
+    @property
+    def size(self):
+        return self.kind.size
+
+    @property
+    def color(self):
+        return self.kind.color
+
+    @property
+    def image(self):
+        return self.kind.image
+
+    @property
+    def nutrition(self):
+        return self.kind.nutrition
+
+    def place(self, boundary, position=None):
+        """
+        put the item at the given position or at a random position within the boundary
+        a placed item gets a new uid, a respawned item is a new item for the individuals
+        """
+        self.uid = next(uids)
         if position is None:
             _left_border = boundary
             _right_border = int(self.parent.frame_dimension[0]) - boundary
@@ -21,8 +64,9 @@ class GameItem():
         else:
             self._position = position
 
-    def draw_image(self, painter):
-        item_image = QImage(self.image)
-        painter.drawImage(QPointF(self._position[0]-(item_image.height()/2), 
-                                  self._position[1]-(item_image.width()/2)), 
-                                  item_image)
\ No newline at end of file
+    def reset(self, boundary, position=None):
+        """
+        respawn a removed item instead of creating a new one
+        takes the same arguments as the constructor (without parent)
+        """
+        self.place(boundary, position)
@@ -1,34 +1,5 @@
 from game.items.game_item import GameItem
-from PyQt5.QtGui import QPainter, QColor, QFont, QBrush, QPen, QPolygonF, QImage
-from PyQt5.QtCore import QPointF
 
 class HealPotion(GameItem):
-    def __init__(self, parent, boundary, position=None):
-        GameItem.__init__(self, parent, boundary, position)
-        self.health_potion_config = self.items_config['heal_potion']
-        self.size = self.health_potion_config['size']
-        self.color = self.health_potion_config['color']
-        self.image = self.health_potion_config['image']
-
-    def draw(self, painter):
-        if self.image is "":
-            self.draw_polygon(painter)
-        else:
-            self.draw_image(painter)
-
-    def draw_polygon(self, painter):
-        color = QColor(self.color)
-        painter.setPen(QColor(0, 0, 0))
-        painter.setBrush(color)
-
-        r = self.size/2
-
-        polygon = QPolygonF()
-        polygon.append(QPointF(self._position[0] + r, self._position[1] + r/2))
-        polygon.append(QPointF(self._position[0]    , self._position[1] + r  ))
-        polygon.append(QPointF(self._position[0] - r, self._position[1] + r/2))
-        polygon.append(QPointF(self._position[0] - r, self._position[1] - r/2))
-        polygon.append(QPointF(self._position[0]    , self._position[1] - r  ))
-        polygon.append(QPointF(self._position[0] + r, self._position[1] - r/2))
-
-        painter.drawPolygon(polygon)
+    __slots__ = ()
+    config_key = "heal_potion"
@@ -0,0 +1,111 @@
+import json
+import time
+
+
+class PhaseMetrics:
+    """
+    wall time and call counts of the phases of EGame.update
+    a phase is recorded with
+        start = metrics.clock()
+        ...
+        start = metrics.record('phase', start)
+    record returns the current time, so phases can be chained
+    calls counts every phase once per population and frame in both engines,
+    the objects engine adds the time of its individuals with calls=0
+    """
+    # phases in the order they happen in a frame
+    PHASES = ['health', 'seek', 'boundaries', 'integration', 'predators',
+              'create_items', 'breed_pop1', 'breed_pop2', 'image_swap']
+
+    def __init__(self, dump_frames=0, dump_file=""):
+        self.seconds = dict.fromkeys(self.PHASES, 0.0)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+        self.frames = 0
+        # dump the summary every n frames (0 = never)
+        self.dump_frames = dump_frames
+        # append the dumps as json lines to this file (empty = print them)
+        self.dump_file = dump_file
+
+    def clock(self):
+        return time.perf_counter()
+
+    def record(self, phase, start, calls=1):
+        """
+        add the time since start to the phase
+        """
+        now = time.perf_counter()
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + now - start
+        self.calls[phase] = self.calls.get(phase, 0) + calls
+        return now
+
+    def count(self, *phases):
+        """
+        count one call of every phase without adding time
+        """
+        for phase in phases:
+            self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def end_frame(self):
+        """
+        count the frame and dump the summary if it is time to
+        """
+        self.frames += 1
+        if self.dump_frames and self.frames % self.dump_frames == 0:
+            self.dump()
+
+    def summary(self):
+        """
+        dict phase -> calls, total seconds, milliseconds per frame and share of the total time
+        """
+        total = sum(self.seconds.values())
+        phases = {}
+        for phase, seconds in self.seconds.items():
+            phases[phase] = {
+                'calls': self.calls[phase],
+                'seconds': seconds,
+                'ms_per_frame': 1000 * seconds / self.frames if self.frames else 0.0,
+                'share': seconds / total if total else 0.0,
+            }
+        return {'frames': self.frames, 'seconds': total, 'phases': phases}
+
+    def dump(self):
+        summary = self.summary()
+        if self.dump_file:
+            with open(self.dump_file, "a") as f:
+                f.write(json.dumps(summary) + "\n")
+        else:
+            print("frame", self.frames, " ".join(
+                phase + ": %.3fms" % values['ms_per_frame']
+                for phase, values in summary['phases'].items()))
+
+    def reset(self):
+        self.seconds = dict.fromkeys(self.PHASES, 0.0)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+        self.frames = 0
+
+
+class NoMetrics:
+    """
+    stand-in for PhaseMetrics if the instrumentation is disabled
+    every hook does nothing
+    """
+    def clock(self):
+        return 0
+
+    def record(self, phase, start, calls=1):
+        return 0
+
+    def count(self, *phases):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def summary(self):
+        return None
+
+    def dump(self):
+        pass
+
+    def reset(self):
+        pass
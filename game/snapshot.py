@@ -0,0 +1,32 @@
+import copy
+
+
+class SnapshotList(list):
+    """
+    copied list of game objects
+    keeps the number of removals of the list it was copied from
+    """
+    def __init__(self, objects, removals=0):
+        list.__init__(self, objects)
+        self.removals = removals
+
+
+class GameSnapshot:
+    """
+    copy of everything that is drawn or shown in the statistics of an EGame
+    it does not change when the game goes on,
+    so it can be read while the game is updated in another thread
+    """
+    def __init__(self, game):
+        self.serial = game.serial
+        self.running = game.running
+        self.frame = game.frames_played
+        self.border_width = game.border_width
+        self.colors = game.colors
+        self.game_objects = {}
+        for type, objects in game.game_objects.items():
+            if type in ['pop1', 'pop2', 'predators']:
+                copies = [i.snapshot() for i in objects]
+            else:
+                copies = [copy.copy(item) for item in objects]
+            self.game_objects[type] = SnapshotList(copies, getattr(objects, 'removals', 0))
@@ -0,0 +1,155 @@
+import math
+
+import numpy as np
+
+
+class SpatialList(list):
+    """
+    list of game objects with a uniform grid (spatial hash) on top
+    objects are bucketed by the cell their position falls into
+    so that only the neighbouring cells of a position have to be visited
+    to find the objects within a radius
+    """
+    def __init__(self, cell_size, objects=()):
+        list.__init__(self, objects)
+        self.cell_size = cell_size
+        # cell -> {id(object): object}
+        self.cells = {}
+        # id(object) -> cell
+        self.cell_of = {}
+        for obj in self:
+            self.add_to_grid(obj)
+
+    def cell(self, position):
+        """
+        get the grid cell of a position
+        """
+        return (math.floor(position[0] / self.cell_size),
+                math.floor(position[1] / self.cell_size))
+
+    def add_to_grid(self, obj):
+        """
+        put an object into the cell of its current position
+        """
+        key = self.cell(obj._position)
+        self.cells.setdefault(key, {})[id(obj)] = obj
+        self.cell_of[id(obj)] = key
+
+    def remove_from_grid(self, obj):
+        """
+        remove an object from the grid
+        """
+        key = self.cell_of.pop(id(obj), None)
+        if key is not None:
+            cell = self.cells[key]
+            del cell[id(obj)]
+            if not cell:
+                del self.cells[key]
+
+    def append(self, obj):
+        list.append(self, obj)
+        self.add_to_grid(obj)
+
+    def remove(self, obj):
+        list.remove(self, obj)
+        self.remove_from_grid(obj)
+
+    def __contains__(self, obj):
+        # constant time membership test through the grid
+        return id(obj) in self.cell_of
+
+    def move(self, obj):
+        """
+        update the cell of an object after its position changed
+        """
+        key = self.cell(obj._position)
+        if self.cell_of.get(id(obj)) != key:
+            self.remove_from_grid(obj)
+            self.add_to_grid(obj)
+
+    def near(self, position, radius):
+        """
+        get all objects in the cells covered by the square
+        around position with the given radius
+        the caller still has to check the exact distance
+        """
+        x0, y0 = self.cell((position[0] - radius, position[1] - radius))
+        x1, y1 = self.cell((position[0] + radius, position[1] + radius))
+        candidates = []
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                cell = self.cells.get((x, y))
+                if cell is not None:
+                    candidates.extend(cell.values())
+        return candidates
+
+
+class ItemList(SpatialList):
+    """
+    SpatialList for items (food, poison, potions, corpses)
+    every item has a slot (its index), removing an item moves the last item
+    into the free slot instead of shifting the whole list
+    the positions of all items are kept as rows of one array
+    removed items are kept to be reused for the next items
+    """
+    def __init__(self, cell_size, objects=()):
+        # id(item) -> slot
+        self.slot_of = {}
+        self.rows = np.zeros((max(16, len(objects)), 2))
+        # items removed in the current frame
+        self.freed = []
+        # items which can be reused
+        self.pool = []
+        # number of removals, items are only appended at the end otherwise
+        # (the renderer redraws its item layer only if an item was removed)
+        self.removals = 0
+        SpatialList.__init__(self, cell_size)
+        for obj in objects:
+            self.append(obj)
+
+    @property
+    def positions(self):
+        """
+        positions of all items (n, 2) in the order of the list
+        """
+        return self.rows[:len(self)]
+
+    def append(self, obj):
+        slot = len(self)
+        if slot == len(self.rows):
+            # double the capacity
+            self.rows = np.concatenate([self.rows, np.zeros(self.rows.shape)])
+        self.rows[slot] = obj._position
+        self.slot_of[id(obj)] = slot
+        SpatialList.append(self, obj)
+
+    def remove(self, obj):
+        slot = self.slot_of.pop(id(obj), None)
+        if slot is None:
+            raise ValueError("ItemList.remove(x): x not in list")
+        last = list.pop(self)
+        if last is not obj:
+            # fill the gap with the last item
+            list.__setitem__(self, slot, last)
+            self.slot_of[id(last)] = slot
+            self.rows[slot] = self.rows[len(self)]
+        self.remove_from_grid(obj)
+        self.freed.append(obj)
+        self.removals += 1
+
+    def reuse(self):
+        """
+        get a removed item to respawn it (None if there is none)
+        """
+        if self.pool:
+            return self.pool.pop()
+        return None
+
+    def end_frame(self):
+        """
+        items removed in this frame can be reused from the next frame on
+        individuals still remember them as seen in this frame,
+        a respawned item must not be mistaken for one they have seen
+        """
+        self.pool.extend(self.freed)
+        self.freed.clear()
@@ -0,0 +1,95 @@
+"""
+vectorized versions of the steering methods of Individual
+(calc_force, apply_force, stay_in_boundaries, limit and set_magnitude)
+every function works on the rows of a whole population at once
+and follows the same order of operations as the per-object methods
+"""
+import numpy as np
+
+
+def limit(vectors, magnitudes):
+    """
+    clip every row vector whose length is larger than
+    the respective magnitude
+    """
+    lengths = np.linalg.norm(vectors, axis=-1)
+    too_long = lengths > magnitudes
+    scale = np.ones(lengths.shape)
+    scale[too_long] = (magnitudes * np.ones(lengths.shape))[too_long] / lengths[too_long]
+    return vectors * scale[..., np.newaxis]
+
+
+def set_magnitude(vectors, magnitudes):
+    """
+    set the length of every row vector to the respective magnitude
+    by keeping the direction (zero vectors stay zero)
+    """
+    lengths = np.linalg.norm(vectors, axis=-1)
+    non_zero = lengths != 0
+    scale = np.ones(lengths.shape)
+    scale[non_zero] = (magnitudes * np.ones(lengths.shape))[non_zero] / lengths[non_zero]
+    return vectors * scale[..., np.newaxis]
+
+
+def desire_forces(positions, velocities, targets, desires, inverse, max_speeds, max_forces):
+    """
+    calc_force for all individuals (N) and all object types (K) at once
+    positions: (N, 2)
+    velocities: (N, K, 2) velocity of every individual when the type was seeked
+    targets: (N, K, 2) position of the closest object per type
+    desires: (N, K) desire per type
+    inverse: (K,) True for the types which are dodged instead of seeked
+    max_speeds, max_forces: (N,)
+    returns the desire weighted steering forces (N, K, 2)
+    """
+    desired = targets - positions[:, np.newaxis, :]
+    desired[:, inverse] = -desired[:, inverse]
+    # set the desired vector length to max
+    desired = set_magnitude(desired, max_speeds[:, np.newaxis])
+    # calculate and limit the steering vector
+    steer = desired - velocities
+    return limit(steer, max_forces[:, np.newaxis]) * desires[..., np.newaxis]
+
+
+def apply_force(accelerations, forces, mask, max_forces):
+    """
+    apply_force for all rows in mask
+    """
+    accelerations[mask] = limit(accelerations[mask] + forces[mask], max_forces[mask])
+
+
+def apply_desire_forces(accelerations, forces, found, velocities, max_forces):
+    """
+    apply the forces (N, K, 2) of all types in order for the rows in which
+    an object of the type was found (N, K)
+    rows without any object move on in the direction of their velocity
+    """
+    for k in range(forces.shape[1]):
+        apply_force(accelerations, forces[:, k], found[:, k], max_forces)
+    # if there is nothing, move on
+    nothing = ~found.any(axis=1)
+    steer = limit(velocities, max_forces)
+    apply_force(accelerations, steer, nothing, max_forces)
+
+
+def boundary_forces(positions, velocities, max_speeds, max_forces, boundary, width, height):
+    """
+    stay_in_boundaries for all rows
+    returns the steering forces (N, 2) and a mask of the rows outside the boundary
+    """
+    x = positions[:, 0]
+    y = positions[:, 1]
+    left = x < boundary
+    right = x > width - 2 * boundary
+    top = y < boundary
+    bottom = y > height - 2 * boundary
+    desired = np.zeros(positions.shape)
+    # vertical violations overrule horizontal ones (as in stay_in_boundaries)
+    desired[left] = np.stack([max_speeds[left], velocities[left, 1]], axis=1)
+    desired[right] = np.stack([-max_speeds[right], velocities[right, 1]], axis=1)
+    desired[top] = np.stack([velocities[top, 0], max_speeds[top]], axis=1)
+    desired[bottom] = np.stack([velocities[bottom, 0], -max_speeds[bottom]], axis=1)
+    outside = left | right | top | bottom
+    desired *= max_speeds[:, np.newaxis]
+    steer = limit(desired - velocities, max_forces / 2)
+    return steer, outside
@@ -0,0 +1,36 @@
+import numpy as np
+
+
+def query_visible(positions, radii, objects, chunk_size=256):
+    """
+    batched version of Individual.get_visible_objects
+    checks all seeking positions (N, 2) against all objects at once
+    with a distance matrix which is built chunk by chunk
+    returns for every position a list of (object, distance) tuples
+    within the respective radius, sorted with increasing distance
+    (the first one is the closest)
+    """
+    visible = [[] for _ in range(len(positions))]
+    if hasattr(objects, "positions"):
+        # items keep their positions in an array already
+        targets = objects
+        target_positions = objects.positions
+    else:
+        # dead individuals are not visible
+        targets = [o for o in objects if not (hasattr(o, "dead") and o.dead)]
+        target_positions = np.array([o._position for o in targets]).reshape(-1, 2)
+    if len(visible) == 0 or len(targets) == 0:
+        return visible
+    for start in range(0, len(positions), chunk_size):
+        block = positions[start:start + chunk_size]
+        delta = block[:, np.newaxis, :] - target_positions[np.newaxis, :, :]
+        distances = np.sqrt(np.sum(delta * delta, axis=2))
+        rows, cols = np.nonzero(distances <= radii[start:start + chunk_size, np.newaxis])
+        d = distances[rows, cols]
+        # sort by row, then by distance (ties keep the order of the objects)
+        order = np.lexsort((d, rows))
+        for row, col, dist in zip(rows[order].tolist(),
+                                  cols[order].tolist(),
+                                  d[order].tolist()):
+            visible[start + row].append((targets[col], dist))
+    return visible
@@ -0,0 +1,95 @@
+import numpy as np
+from game import steering
+from game.individuals.genome import PERCEPTION, DESIRES, ABILITIES, GENOME_LENGTH
+
+
+class PopulationState:
+    """
+    structure of arrays for a group of individuals (a population or the predators)
+    every individual is bound to one row (slot) of the arrays
+    and reads / writes its position, velocity, acceleration, health and poison
+    through views into these rows
+    """
+    def __init__(self, individuals):
+        # breeders may hand back the same individual more than once
+        # every individual gets exactly one slot
+        self.members = []
+        seen = set()
+        for individual in individuals:
+            if id(individual) not in seen:
+                seen.add(id(individual))
+                self.members.append(individual)
+        n = len(self.members)
+
+        # kinematics
+        self.position = np.zeros((n, 2))
+        self.velocity = np.zeros((n, 2))
+        self.acceleration = np.zeros((n, 2))
+        # condition
+        self.health = np.zeros(n)
+        self.poison = np.zeros(n)
+        self.dead = np.zeros(n, dtype=bool)
+        # traits: perception (6) | desires (6) | abilities (5)
+        self.traits = np.zeros((n, GENOME_LENGTH))
+        # values derived from the traits
+        self.max_speed = np.zeros(n)
+        self.max_force = np.zeros(n)
+        self.health_reduce = np.zeros(n)
+
+        for slot, individual in enumerate(self.members):
+            individual.bind_state(self, slot)
+            self.sync_traits(slot)
+
+    def __len__(self):
+        return len(self.members)
+
+    def sync_traits(self, slot):
+        """
+        copy the trait values of the individual in the given slot into the arrays
+        """
+        individual = self.members[slot]
+        self.traits[slot, PERCEPTION] = individual.perception.get_dna()
+        self.traits[slot, DESIRES] = individual.desires.get_dna()
+        if individual.abilities is not None:
+            self.traits[slot, ABILITIES] = individual.abilities.get_dna()
+        self.max_speed[slot] = individual.get_own_max_speed()
+        self.max_force[slot] = individual.max_force
+        self.health_reduce[slot] = individual.health_reduce_per_poison()
+
+    def alive(self):
+        """
+        boolean mask of all living individuals
+        """
+        return ~self.dead
+
+    def decrase_health(self, mask):
+        """
+        array version of Individual.decrase_health for all rows in mask
+        """
+        self.health[mask] -= self.health_reduce[mask] * self.poison[mask]
+
+    def stay_in_boundaries(self, mask, boundary, width, height):
+        """
+        array version of Individual.stay_in_boundaries for all rows in mask
+        """
+        steer, outside = steering.boundary_forces(self.position[mask],
+                                                  self.velocity[mask],
+                                                  self.max_speed[mask],
+                                                  self.max_force[mask],
+                                                  boundary, width, height)
+        acceleration = self.acceleration[mask]
+        steering.apply_force(acceleration, steer, outside, self.max_force[mask])
+        self.acceleration[mask] = acceleration
+
+    def update(self, mask):
+        """
+        array version of Individual.update for all rows in mask
+        apply acceleration to velocity and velocity to position
+        """
+        acceleration = steering.limit(self.acceleration[mask], self.max_force[mask])
+        velocity = steering.limit(self.velocity[mask] + acceleration, self.max_speed[mask])
+        self.velocity[mask] = velocity
+        self.position[mask] += velocity
+        # reset acceleration after each iteration
+        self.acceleration[mask] = 0.0
+
@@ -1,6 +1,9 @@
 from game.individuals.dot import Dot
+from game.individuals.genome import genome_matrix, create_individuals, COLUMN, BLOCKS
+from game.individuals.statistic import statistic_table
+from game.breeding import selection, operators
 
-from random import choice, uniform
+from random import choice
 from copy import copy
 
 import numpy as np
@@ -84,155 +87,83 @@ class Breeder:
             else:
                 alive.append(individual)
 
-        for _ in range(len(dead)):
+        # the parents of all children are selected at once from the population before breeding
+        parents = self.select_example(population, len(dead))
+        if len(parents) > 0:
+            genomes = genome_matrix(population)
+            statistics = statistic_table(population)
+            # all children are bred at once, child a of every pair from its first parent, b from its second
+            children_a, children_b = self.crossover_example(genomes[parents[:, 0]], genomes[parents[:, 1]])
+            children_a = self.tweak_example(children_a)
+            children_b = self.tweak_example(children_b)
+            # the children keep the statistics of their parents
+            score_children_a = self.assess_genome_fitness_example(children_a, statistics[parents[:, 0]])
+            score_children_b = self.assess_genome_fitness_example(children_b, statistics[parents[:, 1]])
+            children = np.where((score_children_a > score_children_b)[:, None], children_a, children_b)
             # get the position where the child should be inserted on the field
-            where = choice(alive)._position
-            color = alive[0].color
-
-            selected = self.select_example(population_cpy)
-            parent1 = selected[0]
-            parent2 = selected[1]
-            child1, child2 = self.crossover_example(copy(parent1), copy(parent2))
-            child1 = self.tweak_example(child1)
-            child2 = self.tweak_example(child2)
-            score_child1 = self.assess_individual_fitness_example(child1)
-            score_child2 = self.assess_individual_fitness_example(child2)
-            if score_child1 > score_child2:
-                new_individual = Dot(self.parent, color=color, position=where, dna=child1.get_dna())
-            else:
-                new_individual = Dot(self.parent, color=color, position=where, dna=child2.get_dna())
-            population_cpy.append(new_individual)
+            positions = [choice(alive)._position for _ in range(len(children))]
+            population_cpy += create_individuals(self.parent, children, alive[0].color, positions)
         for dead_individual in dead:
             population_cpy.remove(dead_individual)
         return population_cpy
 
 
-    def tweak_example(self, individual):
+    def tweak_example(self, genomes):
         """
         we want to increase the trait to seek food and increase armor
+        (all rows of a genome matrix at once)
         """
+        increase = np.random.uniform(0, 0.1, len(genomes))
+        # move increase from a random other gene which has enough to the desired gene of every block
+        for block, gene in zip(BLOCKS, (3, 3, 2)):
+            genomes = operators.shift_mutation(genomes, block, gene, increase)
+        return genomes
 
-        dna = individual.get_dna()
-        increase = uniform(0, 0.1)
-
-        perc = dna[0]
-        des = dna[1]
-        abil = dna[2]
-
-        perc = self.mutate_dna(
-            dna=perc, increase_value=increase, increase=3)
-        des = self.mutate_dna(
-            dna=des, increase_value=increase, increase=3)
-        abil = self.mutate_dna(
-            dna=abil, increase_value=increase, increase=2)
-
-        dna = [perc, des, abil]
-        individual.dna_to_traits(dna)
-        return individual
-
-    def mutate_dna(self, dna, increase_value, increase):
-        # select some other dna to be decreased
-        choices = [i for i in range(len(dna))]
-        choices.remove(increase)
-        decreased = False
-        while not decreased:
-            decrease = choice(choices)
-            if dna[decrease] - increase_value >= 0.0:
-                dna[decrease] -= increase_value
-                decreased = True
-            else:
-                choices.remove(decrease)
-            if len(choices) == 0:
-                break
-        # if we were able to reduce the value for the other dna -> increase the desired dna
-        if decreased:
-            # increase the value
-            dna[increase] += increase_value if dna[increase] <= 1.0 else 1.0
-        # otherwise we cannot do anything
-        return dna
-
-
-    def crossover_example(self, solution_a, solution_b):
-        """
-        crossover of two individuals
-        """
-        dna_a = solution_a.get_dna()
-        dna_b = solution_b.get_dna()
-        for i in range(len(dna_a)):
-            if uniform(0, 1) < 0.5:
-                tmp = dna_a[i]
-                dna_a[i] = dna_b[i]
-                dna_b[i] = tmp
-        solution_a.dna_to_traits(dna_a)
-        solution_b.dna_to_traits(dna_b)
-        return solution_a, solution_b
-
-    def select_example(self, population):
+    def crossover_example(self, genomes_a, genomes_b):
+        """
+        crossover of the pairs of parents (rows of two genome matrices)
+        """
+        # every block (perception, desires, abilities) is swapped with the chance
+        return operators.block_crossover(genomes_a, genomes_b, 0.5)
+
+    def select_example(self, population, pairs):
         """
         example select
+        indices of two parents for each of the pairs children (pairs, 2)
         """
-        fitness_array = np.empty([len(population)])
-        for i in range(len(population)):
-            score = self.assess_individual_fitness_example(population[i])
-            fitness_array[i] = score
-        
-        # span value range
-        for i in range(1, len(fitness_array)):
-            fitness_array[i] = fitness_array[i] + fitness_array[i - 1]
-        
-        parents = self.selectParentSUS(population, fitness_array, 2)
-        return parents
-
-    def selectParentSUS(self, population, fitness_array, count):
-        """
-        Stochastic uniform sampling
-        """
-        individual_indices = []
-        # build the offset = random number between 0 and f_l / n
-        offset = uniform(0, fitness_array[-1] / count)
-        # repeat for all selections (n)
-        for _ in range(count):
-            index = 0
-            # increment the index until we reached the offset
-            while fitness_array[index] < offset:
-                index += 1
-            # increment the offset to the next target
-            offset = offset + fitness_array[-1] / count
-            individual_indices.append(population[index])
-        # return all selected individual indices
-        return np.array(individual_indices)
+        fitness_array = self.assess_population_fitness_example(population)
+        # span value range once for all children
+        cumulative = selection.cumulative_fitness(fitness_array)
+        return selection.sus_pairs(cumulative, pairs)
+
+    def assess_population_fitness_example(self, population):
+        """
+        assess_individual_fitness_example of the whole population at once
+        """
+        return self.assess_genome_fitness_example(genome_matrix(population), statistic_table(population))
+
+    def assess_genome_fitness_example(self, genomes, statistics):
+        """
+        example fitness assessment of the rows of a genome matrix
+        with their statistics (structured array, see statistic_table)
+        """
+        # statistics of the individuals, one column per counter
+        # refer to Statistic class (FIELDS)
+        # what parameter are stored in a statistic object
+        # statistics['food_eaten'][i] is the food eaten by individual i
+        # genomes of the individuals, one row per individual
+        # refer to game.individuals.genome (COLUMNS)
+        # perception:  food, poison, health_potion, opponent, corpse, predator
+        # desires:     seek_food, dodge_poison, seek_potion, seek_opponents,
+        #              seek_corpse, dodge_predators
+        # abilities:   armor_ability, speed, strength, poison_resistance, toxicity
+        # genomes[:, COLUMN['food']] is the food perception of all individuals
+        return genomes[:, COLUMN['opponent']] + genomes[:, COLUMN['seek_opponents']] + genomes[:, COLUMN['strength']] + \
+            statistics['enemies_attacked'] + statistics['consumed_corpses'] + statistics['opponents_seen']
 
     def assess_individual_fitness_example(self, individual):
         """
         example fitness assessment of an individual
+        (see assess_genome_fitness_example)
         """
-        # get statistics of individual
-        # refer to Statistic class
-        # what parameter are stored in a statistic object
-        statistic = individual.statistic
-        # get dna of individual
-        # multi dimensional array
-        # perception_dna_array = [0][x]
-        #   food =               [0][0]
-        #   poison =             [0][1]
-        #   health_potion =      [0][2]
-        #   opponent =           [0][3]
-        #   corpse =             [0][4]
-        #   predator =           [0][5]
-        # desires_dna_array =    [1][x]
-        #   seek_food =          [1][0]
-        #   dodge_poison =       [1][1]
-        #   seek_potion =        [1][2]
-        #   seek_opponents =     [1][3]
-        #   seek_corpse =        [1][4]
-        #   dodge_predators =    [1][5]
-        # abilities_dna_array =  [2][x]
-        #   armor_ability =      [2][0]
-        #   speed =              [2][1]
-        #   strength =           [2][2]
-        #   poison_resistance =  [2][3]
-        #   toxicity =           [2][4]
-        dna = individual.get_dna()
-        score = dna[0][3] + dna[1][3] + dna[2][2] + \
-            statistic.enemies_attacked + statistic.consumed_corpses + statistic.opponents_seen
-        return score
+        return self.assess_population_fitness_example([individual])[0]
@@ -1,6 +1,12 @@
 from game.individuals.dot import Dot
+from game.breeding import operators
+from game.breeding.fitness_cache import breeding_round, cached_fitness
+from game.breeding.diversity import diverse_to
+from game.breeding.sampling import Buckets, diverse_genomes
+from game.individuals.genome import COLUMN, BLOCKS, PERCEPTION, DESIRES, GENOME_LENGTH
+from game.individuals.genome import create_individuals, genome_matrix
 
-from random import choice, uniform
+from random import choice
 from copy import copy
 
 import numpy as np
@@ -10,9 +16,31 @@ class Breeder:
     References used:
     Luke, S. (2013). Essentials of metaheuristics. Lulu.com.
     '''
+    # columns of the genes swapped together by crossover_shift
+    crossover_groups = (
+        # hunger
+        [COLUMN['food'], COLUMN['seek_food'], COLUMN['speed']],
+        # status
+        [COLUMN['poison'], COLUMN['health_potion'], COLUMN['dodge_poison'],
+         COLUMN['seek_potion'], COLUMN['poison_resistance']],
+        # aggresion
+        [COLUMN['opponent'], COLUMN['predator'], COLUMN['seek_opponents'],
+         COLUMN['dodge_predators'], COLUMN['armor_ability'], COLUMN['strength']],
+        # others
+        [COLUMN['corpse'], COLUMN['seek_corpse'], COLUMN['toxicity']],
+    )
+    # genes which tweak increases depending on the main trait,
+    # for perception, desires and abilities
+    tweaked_genes = (
+        {"survival": range(0, 6), "attack": (3,), "defense": (1, 5)},
+        {"survival": range(0, 6), "attack": (3,), "defense": (1, 5)},
+        {"survival": (0, 3, 4), "attack": (2,), "defense": (2,)},
+    )
+
     def __init__(self, parent):
         self.parent = parent
 
+    @breeding_round
     def breed(self, population):
         """
         this function gets called by the EGame on one population
@@ -35,23 +63,17 @@ class Breeder:
         initializer that allows only individuals with a certain diversity.
         according to (Luke, 2013) Page 32
         """
-        population = []
-        population.append(Dot(self.parent, color=color))
-        while (len(population) < num_individuals):
-            individual = Dot(self.parent, color=color)
-            if self.check_diversity_population(population, individual):
-                population.append(individual)
+        # genomes which pass check_diversity_population are sampled directly
+        population = create_individuals(self.parent, diverse_genomes(num_individuals, accuracy=2), color)
         
         print("David's population with ",len(population), "individuals and with color", population[0].color[1])
         return population
     
     def check_diversity_population(self, existing_population, new_member):
-        for old_member in existing_population:
-            if not self.is_diverse(old_member, new_member): 
-                #print("Is not diverse enough, choose next...")
-                return False
-        #print("Is diverse enough.")
-        return True
+        if len(existing_population) == 0:
+            return True
+        # the new member is compared with all members at once
+        return bool(diverse_to(genome_matrix(existing_population), new_member.genome, 2).all())
 
     def is_diverse(self, old_member, new_member, accuracy=2):
         """
@@ -60,21 +82,7 @@ class Breeder:
         adjust the accuracy to change the rounded number
         2 seems to be a good number for the initialization procedure
         """
-        isDiverse = True
-        old_member = old_member.get_dna()
-        new_member = new_member.get_dna()
-        
-        for dna in range(0,3):
-            for sub_trait in range(0,5):
-                if round(old_member[dna][sub_trait], accuracy) == round(new_member[dna][sub_trait], accuracy):
-                     return False
-        # check the two members that are not so easily iterateable
-        if round(old_member[0][5], accuracy) == round(new_member[0][5], accuracy):
-            return False
-        if round(old_member[1][5], accuracy) == round(new_member[1][5], accuracy):
-            return False  
-        
-        return isDiverse
+        return bool(diverse_to(old_member.genome, new_member.genome, accuracy)[0])
 
     def breed_example_with_ga(self, population):
         """
@@ -82,6 +90,8 @@ class Breeder:
         """
         population_cpy = copy(population)
         self.evaluate_profession(population)
+        # parent candidates grouped by their main trait
+        candidates = Buckets(population, self.evaluate_most_valued_trait)
         dead = []
         alive = []
         for individual in population_cpy:
@@ -90,141 +100,77 @@ class Breeder:
             else:
                 alive.append(individual)
 
-        for _ in range(len(dead)):
-            # get the position where the child should be inserted on the field
-            where = choice(alive)._position
-            color = alive[0].color
-
-            selected = self.select_with_tournament(population_cpy)
-            parent1 = selected[0]
-            parent2 = selected[1]
-            child1, child2 = self.crossover_swap(copy(parent1), copy(parent2))
-            child1 = self.tweak(child1)
-            child2 = self.tweak(child2)
-            score_child1 = self.assess_individual_fitness(child1)
-            score_child2 = self.assess_individual_fitness(child2)
-            if self.dominantes(score_child1, score_child2):
-                new_individual = Dot(self.parent, color=color, position=where, dna=child1.get_dna())
-            else:
-                new_individual = Dot(self.parent, color=color, position=where, dna=child2.get_dna())
-            population_cpy.append(new_individual)
+        # the parents of all children are selected first, the children are bred at once
+        parents = [self.select_with_tournament(population, candidates) for _ in range(len(dead))]
+        if parents:
+            genomes_a, genomes_b = self.crossover_swap(genome_matrix([pair[0] for pair in parents]),
+                                                       genome_matrix([pair[1] for pair in parents]))
+            genomes_a = self.tweak(genomes_a)
+            genomes_b = self.tweak(genomes_b)
+            new_genomes = []
+            positions = []
+            for row, (parent1, parent2) in enumerate(parents):
+                # get the position where the child should be inserted on the field
+                positions.append(choice(alive)._position)
+                # the children keep the statistic of their parent (the fitness is only based on it)
+                score_child1 = self.assess_individual_fitness(parent1)
+                score_child2 = self.assess_individual_fitness(parent2)
+                if self.dominantes(score_child1, score_child2):
+                    new_genomes.append(genomes_a[row])
+                else:
+                    new_genomes.append(genomes_b[row])
+            population_cpy += create_individuals(self.parent, new_genomes, alive[0].color, positions)
         for dead_individual in dead:
             population_cpy.remove(dead_individual)
         return population_cpy
 
 
-    def tweak(self, individual):
+    def tweak(self, genomes):
         """
         first tweak towards the profession,
         then tweak once completly random or swap genes
+        (all rows of a genome matrix at once)
         """
-        dna = individual.get_dna()
-        main_trait = self.evaluate_most_valued_trait(individual)
-        increase = uniform(0,0.1)
-        perc = dna[0]
-        des = dna[1]
-        abil = dna[2]
-        
-        if (main_trait is "survival"):
-            perc = self.mutate_dna(
-                dna=perc, increase_value=increase, increase=choice(range(0,6)))
-            des = self.mutate_dna(
-                dna=des, increase_value=increase, increase=choice(range(0,6)))
-            abil = self.mutate_dna(
-                dna=abil, increase_value=increase, increase=choice((0,3,4)))
-        if (main_trait is "attack"):
-            perc = self.mutate_dna(
-                dna=perc, increase_value=increase, increase=3)
-            des = self.mutate_dna(
-                dna=des, increase_value=increase, increase=3)
-            abil = self.mutate_dna(
-                dna=abil, increase_value=increase, increase=2)
-        if (main_trait is "defense"):
-            perc = self.mutate_dna(
-                dna=perc, increase_value=increase, increase=choice((1,5)))
-            des = self.mutate_dna(
-                dna=des, increase_value=increase, increase=choice((1,5)))
-            abil = self.mutate_dna(
-                dna=abil, increase_value=increase, increase=2)        
-        
-        dna = [perc, des, abil]
-        if (increase > 0.02):
-            next_tweak_slot = choice(range(0,17))
-            dna = self.mutate_dna_normal(dna, next_tweak_slot)
-        else: 
-            dna = self.mutate_dna_shuffle(dna)
+        main_traits = self.most_valued_traits(genomes)
+        increase = np.random.uniform(0, 0.1, len(genomes))
+        for block, tweaked_genes in zip(BLOCKS, self.tweaked_genes):
+            genes = np.zeros(len(genomes), dtype=int)
+            for trait, choices in tweaked_genes.items():
+                rows = main_traits == trait
+                genes[rows] = np.random.choice(choices, np.count_nonzero(rows))
+            genomes = operators.shift_mutation(genomes, block, genes, increase)
+        normal = increase > 0.02
+        genomes[normal] = self.mutate_dna_normal(genomes[normal])
+        genomes[~normal] = self.mutate_dna_shuffle(genomes[~normal])
+        return genomes
 
-        individual.dna_to_traits(self.normalize_dna(dna))
-        return individual
-    
-    def mutate_dna_shuffle(self, dna):
+    def mutate_dna_shuffle(self, genomes):
         '''
         swap two traits in perception and traits
         only swap food, opponents or predators traits
         '''
-        swap_gene_A = choice(range(0,6))
-        swap_gene_B = choice(range(0,6))
-        tmp = dna[0][swap_gene_A]
-        dna[0][swap_gene_A] = dna[0][swap_gene_B]
-        dna[0][swap_gene_B] = tmp
-        tmp = dna[1][swap_gene_A]
-        dna[1][swap_gene_A] = dna[1][swap_gene_B]
-        dna[1][swap_gene_B] = tmp
-        return dna        
+        return operators.swap_mutation(genomes, (PERCEPTION, DESIRES))
 
-    def mutate_dna_normal(self, dna, gene):
+    def mutate_dna_normal(self, genomes):
         '''
         normal mutation, complete random
+        one random gene of every row is increased
         '''
-        increase = uniform(0, 0.1)
-        if gene < 6:
-            dna[0][gene] += increase
-        elif gene < 12:
-            dna[1][gene-6] += increase
-        else:
-            dna[2][gene-12] += increase
-        return dna
-    
-    def mutate_dna(self, dna, increase_value, increase):
-        # select some other dna to be decreased
-        choices = [i for i in range(len(dna))]
-        choices.remove(increase)
-        decreased = False
-        while not decreased:
-            decrease = choice(choices)
-            if dna[decrease] - increase_value >= 0.0:
-                dna[decrease] -= increase_value
-                decreased = True
-            else:
-                choices.remove(decrease)
-            if len(choices) == 0:
-                break
-        # if we were able to reduce the value for the other dna -> increase the desired dna
-        if decreased:
-            # increase the value
-            dna[increase] += increase_value if dna[increase] <= 1.0 else 1.0
-        # otherwise we cannot do anything
-        return dna
+        genomes = np.array(genomes)
+        rows = np.arange(len(genomes))
+        genomes[rows, np.random.randint(0, GENOME_LENGTH, len(genomes))] += np.random.uniform(0, 0.1, len(genomes))
+        return operators.normalize(genomes)
 
-    def crossover_swap(self, solution_a, solution_b):
+    def crossover_swap(self, genomes_a, genomes_b):
         '''
         Since the crossover_shift is to explorative the previous
         crossover might be more desireable.
         '''
-        dna_a = solution_a.get_dna()
-        dna_b = solution_b.get_dna()
-        for i in range(len(dna_a)):
-            if uniform(0, 1) < 0.5:
-                tmp = dna_a[i]
-                dna_a[i] = dna_b[i]
-                dna_b[i] = tmp
-        solution_a.dna_to_traits(dna_a)
-        solution_b.dna_to_traits(dna_b)
-        return solution_a, solution_b     
+        return operators.block_crossover(genomes_a, genomes_b, 0.5)
 
-    def crossover_shift(self, solution_a, solution_b):
+    def crossover_shift(self, genomes_a, genomes_b):
         """
-        crossover of two individuals
+        crossover of the pairs of parents (rows of two genome matrices)
         changing the traits of a specific category
         hunger (food, seek_food, speed)
         status (poison, health_potion, dodge_poison, seek_potion, poison_resistance)
@@ -238,93 +184,21 @@ class Breeder:
         It turns out then when doing the crossover always the algorithm becomes
         very explorative, thats something we don't want.
         """
-        dna_a = solution_a.get_dna()
-        dna_b = solution_b.get_dna()
-        
-        crossover_choice = choice(range(1,100))
-        # don't always do crossover
-        
-        # do hunger crossover
-        if ( crossover_choice == 1 ):
-            tmp = dna_a[0][0]
-            dna_a[0][0] = dna_b[0][0]
-            dna_b[0][0] = tmp
-            tmp = dna_a[1][0]
-            dna_a[1][0] = dna_b[1][0]
-            dna_b[1][0] = tmp
-            tmp = dna_a[2][1]
-            dna_a[2][1] = dna_b[2][1]
-            dna_b[2][1] = tmp
-        # do status crossover
-        if ( crossover_choice == 2 ):
-            tmp = dna_a[0][1]
-            dna_a[0][1] = dna_b[0][1]
-            dna_b[0][1] = tmp
-            tmp = dna_a[0][2]
-            dna_a[0][2] = dna_b[0][2]
-            dna_b[0][2] = tmp
-            tmp = dna_a[1][1]
-            dna_a[1][1] = dna_b[1][1]
-            dna_b[1][1] = tmp
-            tmp = dna_a[1][2]
-            dna_a[1][2] = dna_b[1][2]
-            dna_b[1][2] = tmp
-            tmp = dna_a[2][3]
-            dna_a[2][3] = dna_b[2][3]
-            dna_b[2][3] = tmp
-        # do aggresion crossover
-        if ( crossover_choice == 3 ):
-            tmp = dna_a[0][3]
-            dna_a[0][3] = dna_b[0][3]
-            dna_b[0][3] = tmp
-            tmp = dna_a[0][5]
-            dna_a[0][5] = dna_b[0][5]
-            dna_b[0][5] = tmp
-            tmp = dna_a[1][3]
-            dna_a[1][3] = dna_b[1][3]
-            dna_b[1][3] = tmp
-            tmp = dna_a[1][5]
-            dna_a[1][5] = dna_b[1][5]
-            dna_b[1][5] = tmp
-            tmp = dna_a[2][0]
-            dna_a[2][0] = dna_b[2][0]
-            dna_b[2][0] = tmp
-            tmp = dna_a[2][2]
-            dna_a[2][2] = dna_b[2][2]
-            dna_b[2][2] = tmp
-        # do other crossover
-        if ( crossover_choice == 4 ):
-            tmp = dna_a[0][4]
-            dna_a[0][4] = dna_b[0][4]
-            dna_b[0][4] = tmp
-            tmp = dna_a[1][4]
-            dna_a[1][4] = dna_b[1][4]
-            dna_b[1][4] = tmp
-            tmp = dna_a[2][4]
-            dna_a[2][4] = dna_b[2][4]
-            dna_b[2][4] = tmp
-  
-        solution_a.dna_to_traits(self.normalize_dna(dna_a))
-        solution_b.dna_to_traits(self.normalize_dna(dna_b))
-        return solution_a, solution_b
+        # don't always do crossover, one of the groups is swapped in 4 of 99 cases
+        return operators.group_crossover(genomes_a, genomes_b, self.crossover_groups, 4 / 99)
 
-    def normalize_dna(self, dna):
-        dna[0] = dna[0] / sum(dna[0])
-        dna[1] = dna[1] / sum(dna[1])
-        dna[2] = dna[2] / sum(dna[2])
-        return dna
-
-    def select_with_tournament(self, population):
+    def select_with_tournament(self, population, candidates):
         """
         selects four parents with replacement and the same main trait
         and uses the two strongest to breed
+        candidates are the individuals of the population grouped by their main trait
         """
         parents = []
         choice_A = choice(population)
         main_trait = self.evaluate_most_valued_trait(choice_A)
-        choice_B = self.choose_parent_candidate(population, main_trait)
-        choice_C = self.choose_parent_candidate(population, main_trait)
-        choice_D = self.choose_parent_candidate(population, main_trait)
+        choice_B = self.choose_parent_candidate(candidates, main_trait)
+        choice_C = self.choose_parent_candidate(candidates, main_trait)
+        choice_D = self.choose_parent_candidate(candidates, main_trait)
         
         winner_one = self.binary_tournament(choice_A, choice_B, main_trait)
         winner_two = self.binary_tournament(choice_C, choice_D, main_trait)
@@ -334,16 +208,11 @@ class Breeder:
         
         return parents
     
-    def choose_parent_candidate(self, population, main_trait):
+    def choose_parent_candidate(self, candidates, main_trait):
         '''
         chooses other parent with the same main trait
         '''
-        choice_next = None       
-        other_trait = 100
-        while (other_trait != main_trait):
-            choice_next = choice(population)
-            other_trait = self.evaluate_most_valued_trait(choice_next)
-        return choice_next
+        return candidates.draw(main_trait)
           
     def binary_tournament(self, individual, otherIndividual, main_trait):
         '''
@@ -370,6 +239,7 @@ class Breeder:
                 return False
         return dominating
 
+    @cached_fitness
     def assess_individual_fitness(self, individual):
         """
         making a multi-objective optimization out of that
@@ -405,21 +275,30 @@ class Breeder:
 
         return score
     
+    @cached_fitness
     def evaluate_most_valued_trait(self, individual):
         '''
         Which trait is valued the most?
         survival
         attack
         defense
+        (see most_valued_traits)
+        '''
+        return str(self.most_valued_traits(individual.genome[np.newaxis])[0])
+
+    def most_valued_traits(self, genomes):
+        '''
+        the most valued trait (survival, attack or defense) of every row of a genome matrix
         '''
-        dna = individual.get_dna()
-        survival = ( (float) (dna[2][0] + dna[2][3] + dna[2][4]) ) / 3.0
-        attack = ( (float) (dna[0][3] + dna[1][3] + dna[2][2]) ) / 3.0
-        defense = ( (float) (dna[0][1] + dna[0][5] + dna[1][1] \
-                             + dna[1][5] + dna[2][2]) ) / 5.0
-        if survival > (attack and defense ): return "survival"
-        if attack > defense: return "attack"
-        return "defense"
+        survival = (genomes[:, COLUMN['armor_ability']] + genomes[:, COLUMN['poison_resistance']]
+                    + genomes[:, COLUMN['toxicity']]) / 3.0
+        attack = (genomes[:, COLUMN['opponent']] + genomes[:, COLUMN['seek_opponents']]
+                  + genomes[:, COLUMN['strength']]) / 3.0
+        defense = (genomes[:, COLUMN['poison']] + genomes[:, COLUMN['predator']] + genomes[:, COLUMN['dodge_poison']]
+                   + genomes[:, COLUMN['dodge_predators']] + genomes[:, COLUMN['strength']]) / 5.0
+        # same as survival > (attack and defense)
+        survives = survival > np.where(attack != 0, defense, attack)
+        return np.where(survives, "survival", np.where(attack > defense, "attack", "defense"))
 
     def evaluate_profession(self, population):
         survival = 0
@@ -427,8 +306,8 @@ class Breeder:
         defense = 0
         for individual in population:
             trait = self.evaluate_most_valued_trait(individual)
-            if (trait is "survival"): survival += 1
-            if (trait is "attack"): attack += 1
-            if (trait is "defense"): defense += 1
+            if (trait == "survival"): survival += 1
+            if (trait == "attack"): attack += 1
+            if (trait == "defense"): defense += 1
         print("survival: ", str(survival), "\nattack: ", str(attack), "\ndefense: ", str(defense) )
         
\ No newline at end of file
@@ -1,4 +1,11 @@
 from game.individuals.dot import Dot
+from game.individuals.genome import genome_matrix, COLUMN, BLOCKS, PERCEPTION, DESIRES
+from game.individuals.genome import create_individuals, dna_to_genome, genome_to_dna
+from game.individuals.statistic import statistic_table
+from game.breeding import selection, operators
+from game.breeding.fitness_cache import breeding_round, cached_fitness
+from game.breeding.diversity import diverse_to, population_diversity
+from game.breeding.sampling import diverse_genomes
 
 from random import choice, uniform
 from copy import copy
@@ -46,6 +53,7 @@ class Breeder:
         self.parent = parent
         self.profession = {"Attacker":0,"Defender":0}        
 
+    @breeding_round
     def breed(self, population):
         """
         this function gets called by the EGame on one population
@@ -81,10 +89,10 @@ class Breeder:
             population.append(aggresive_individual)
         
         if (self.defender_random_init):
-            while (len(population) < num_individuals):
-                individual = Dot(self.parent, color=color)
-                if self.check_diversity_population(population, individual):
-                    population.append(individual)
+            # genomes which pass check_diversity_population are sampled directly
+            genomes = diverse_genomes(num_individuals - len(population), accuracy=3,
+                                      existing=genome_matrix(population))
+            population += create_individuals(self.parent, genomes, color)
         else:
             for _ in range(0,num_individuals-self.attacker_number):
                 defensive_individual = Dot(self.parent, color=color)
@@ -101,12 +109,10 @@ class Breeder:
         Compares the new individual with the other individuals in the population.
         It works somehow like pareto dominance checking but not with dominance, instead with diversity.
         '''
-        for old_member in existing_population:
-            if not self.is_diverse(old_member, new_member): 
-                #print("Is not diverse enough, choose next...")
-                return False
-        #print("Is diverse enough.")
-        return True
+        if len(existing_population) == 0:
+            return True
+        # the new member is compared with all members at once
+        return bool(diverse_to(genome_matrix(existing_population), new_member.genome, 3).all())
 
     def is_diverse(self, old_member, new_member, accuracy=3):
         """
@@ -115,21 +121,7 @@ class Breeder:
         adjust the accuracy to change the rounded number
         2 seems to be a good number for the initialization procedure
         """
-        isDiverse = True
-        old_member = old_member.get_dna()
-        new_member = new_member.get_dna()
-        
-        for dna in range(0,3):
-            for sub_trait in range(0,5):
-                if round(old_member[dna][sub_trait], accuracy) == round(new_member[dna][sub_trait], accuracy):
-                     return False
-        # check the two members that are not so easily iterateable
-        if round(old_member[0][5], accuracy) == round(new_member[0][5], accuracy):
-            return False
-        if round(old_member[1][5], accuracy) == round(new_member[1][5], accuracy):
-            return False  
-        
-        return isDiverse
+        return bool(diverse_to(old_member.genome, new_member.genome, accuracy)[0])
 
     def init_attacker(self, where, color):
         '''
@@ -194,10 +186,8 @@ class Breeder:
             return perc, des, abil
     
     def normalize_dna(self, dna):
-        dna[0] = dna[0] / sum(dna[0])
-        dna[1] = dna[1] / sum(dna[1])
-        dna[2] = dna[2] / sum(dna[2])
-        return dna
+        # negative dna is cut at 0, every part sums up to 1.0 afterwards
+        return genome_to_dna(operators.normalize(dna_to_genome(dna))[0])
     
     def breed_depending_on_profession(self, population):
         """
@@ -229,173 +219,108 @@ class Breeder:
             print("The survivers of the last round:")
             self.print_professions()
         
+        # the fitness of both parent pools is assessed once per breeding round
+        # (without attackers the attackers are bred from the whole population)
+        attacker_pool = all_attacker or list(population_cpy)
+        defender_pool = list(population_cpy)
+        attacker_fitness = selection.cumulative_fitness(self.assess_population_fitness(attacker_pool))
+        defender_fitness = selection.cumulative_fitness(self.assess_population_fitness(defender_pool))
+
         needed_individuals = len(dead)
+        # the parents of all children are selected first, the children are bred at once
+        pairs = []
         index = 0
         while index < needed_individuals:
-            # get the position where the child should be inserted on the field
-            where = choice(alive)._position
-            color = alive[0].color
-                        
             # get the desired number of attackers and defenders
             if self.profession["Attacker"] < self.attacker_number:
-                selected = self.select_individual(all_attacker)
-                profession_flag = True
+                selected = self.select_individual(attacker_pool, attacker_fitness)
+                profession = "Attacker"
             else:
-                selected = self.select_individual(population_cpy)
-                profession_flag = False
-            
-            parent1 = selected[0]
-            parent2 = selected[1]
-            child1, child2 = self.crossover_example(copy(parent1), copy(parent2))
-            child1 = self.tweak_depending_on_profession(child1)
-            child2 = self.tweak_depending_on_profession(child2)
+                selected = self.select_individual(defender_pool, defender_fitness)
+                profession = "Defender"
+            # both children are taken while more than two are needed
+            children = 2 if needed_individuals - index > 2 else 1
+            pairs.append((selected[0], selected[1], children))
+            index += children
+            self.profession[profession] += children
+
+        if pairs:
+            genomes_a, genomes_b = self.crossover_example(genome_matrix([pair[0] for pair in pairs]),
+                                                          genome_matrix([pair[1] for pair in pairs]))
+            genomes_a = self.tweak_depending_on_profession(genomes_a)
+            genomes_b = self.tweak_depending_on_profession(genomes_b)
             #score_child1 = self.assess_individual_fitness(child1)
             #score_child2 = self.assess_individual_fitness(child2)
-            if needed_individuals - index > 2:
-                new_individual = Dot(self.parent, color=color, position=where, dna=child1.get_dna())
-                population_cpy.append(new_individual)
-                index += 1
-                if profession_flag: self.profession["Attacker"] += 1
-                else: self.profession["Defender"] +=1
-                new_individual = Dot(self.parent, color=color, position=where, dna=child2.get_dna())
-            else:
-                new_individual = Dot(self.parent, color=color, position=where, dna=child1.get_dna())
-            population_cpy.append(new_individual)
-            index += 1
-            if profession_flag: self.profession["Attacker"] += 1
-            else: self.profession["Defender"] +=1
+            new_genomes = []
+            positions = []
+            for row, (_, _, children) in enumerate(pairs):
+                # get the position where the children should be inserted on the field
+                where = choice(alive)._position
+                new_genomes.append(genomes_a[row])
+                positions.append(where)
+                if children == 2:
+                    new_genomes.append(genomes_b[row])
+                    positions.append(where)
+            population_cpy += create_individuals(self.parent, new_genomes, alive[0].color, positions)
         for dead_individual in dead:
             population_cpy.remove(dead_individual)
         if (self.intermediate_output):
             print("Davidson's with ", len(population_cpy), " individuals, ready for the next round!")
             self.print_professions()
+            print("diversity:", population_diversity(population_cpy, 3))
         return population_cpy
 
-    def tweak_depending_on_profession(self, individual):
+    def tweak_depending_on_profession(self, genomes):
         """
-        we want to tweak the individual depending on the profession
+        we want to tweak the individuals (rows of a genome matrix) depending on the profession
         First the profession is checked.
         Depending on the profession the decision is made which traits are tweaked.
         
         The dna_shuffel is something used instead of the crossover. (while the crossover is
         still activated anyways but with a low value).
         """
-        profession = self.check_profession(individual)
-        p,d,a = self.traits_to_tweak(profession)
-        dna = individual.get_dna()
-        increase = uniform(0, 0.1)
-
-        perc = dna[0]
-        des = dna[1]
-        abil = dna[2]
+        attackers = self.attackers(genomes)
+        increase = np.random.uniform(0, 0.1, len(genomes))
+        for block, attacker_traits, defender_traits in zip(
+                BLOCKS, self.traits_to_tweak("Attacker"), self.traits_to_tweak("Defender")):
+            traits = np.where(attackers,
+                              np.random.choice(attacker_traits, len(genomes)),
+                              np.random.choice(defender_traits, len(genomes)))
+            genomes = operators.shift_mutation(genomes, block, traits, increase)
+        shuffle = increase > 0.09
+        genomes[shuffle] = self.mutate_dna_shuffle(genomes[shuffle])
+        return genomes
 
-        perc = self.mutate_dna(
-            dna=perc, increase_value=increase, increase=choice(p))
-        des = self.mutate_dna(
-            dna=des, increase_value=increase, increase=choice(d))
-        abil = self.mutate_dna(
-            dna=abil, increase_value=increase, increase=choice(a))
-
-        dna = [perc, des, abil]
-        if (increase > 0.09): self.mutate_dna_shuffle(dna)
-        individual.dna_to_traits(dna)
-        return individual
-
-    def mutate_dna(self, dna, increase_value, increase):
-        # select some other dna to be decreased
-        choices = [i for i in range(len(dna))]
-        choices.remove(increase)
-        decreased = False
-        while not decreased:
-            decrease = choice(choices)
-            if dna[decrease] - increase_value >= 0.0:
-                dna[decrease] -= increase_value
-                decreased = True
-            else:
-                choices.remove(decrease)
-            if len(choices) == 0:
-                break
-        # if we were able to reduce the value for the other dna -> increase the desired dna
-        if decreased:
-            # increase the value
-            dna[increase] += increase_value if dna[increase] <= 1.0 else 1.0
-        # otherwise we cannot do anything
-        return dna
-    
-    def mutate_dna_shuffle(self, dna):
+    def mutate_dna_shuffle(self, genomes):
         '''
         swap two traits in perception and desire,
         this is necessary so that individuals can adjust their behaviour rapidly 
         it is somehow a substitute for the crossover.
         '''
-        swap_gene_A = choice(range(0,6))
-        swap_gene_B = choice(range(0,6))
-        tmp = dna[0][swap_gene_A]
-        dna[0][swap_gene_A] = dna[0][swap_gene_B]
-        dna[0][swap_gene_B] = tmp
-        tmp = dna[1][swap_gene_A]
-        dna[1][swap_gene_A] = dna[1][swap_gene_B]
-        dna[1][swap_gene_B] = tmp
-        return dna  
+        return operators.swap_mutation(genomes, (PERCEPTION, DESIRES))
 
-    def crossover_example(self, solution_a, solution_b):
+    def crossover_example(self, genomes_a, genomes_b):
         """
-        crossover of two individuals
+        crossover of the pairs of parents (rows of two genome matrices)
         The crossover is set to a very low value so it doesn't happen to often.
         I basically tried different parameters and it turns out that a lower crossover
         improves my individuals, I suppose this is related to the two professions.
         """
-        dna_a = solution_a.get_dna()
-        dna_b = solution_b.get_dna()
-        for i in range(len(dna_a)):
-            if uniform(0, 1) < self.crossover_chance:
-                tmp = dna_a[i]
-                dna_a[i] = dna_b[i]
-                dna_b[i] = tmp
-        solution_a.dna_to_traits(dna_a)
-        solution_b.dna_to_traits(dna_b)
-        return solution_a, solution_b
+        # every block (perception, desires, abilities) is swapped with the chance
+        return operators.block_crossover(genomes_a, genomes_b, self.crossover_chance)
 
-    def select_individual(self, population):
+    def select_individual(self, population, cumulative_fitness):
         """
         The chosen selection method seems to work fine.
         I tried to use a tournament selection instead, 
         The influence appears to be neglectable.
         More of a "meta-selection" is made in the strategy definition earlier,
         this can be only seen as the last steps in my selection procedure.
-        """
-        fitness_array = np.empty([len(population)])
-        for i in range(len(population)):
-            score = self.assess_individual_fitness(population[i])
-            fitness_array[i] = score
-        
-        # span value range
-        for i in range(1, len(fitness_array)):
-            fitness_array[i] = fitness_array[i] + fitness_array[i - 1]
-        
-        parents = self.selectParentSUS(population, fitness_array, 2)
-        return parents
-
-    def selectParentSUS(self, population, fitness_array, count):
-        """
-        Stochastic uniform sampling
+        Stochastic uniform sampling on the cumulative fitness of the population.
         In my fitness I guranteed that no individual has a very low fitness,
         so here still every individual has a chance to be chosen. 
         """
-        individual_indices = []
-        # build the offset = random number between 0 and f_l / n
-        offset = uniform(0, fitness_array[-1] / count)
-        # repeat for all selections (n)
-        for _ in range(count):
-            index = 0
-            # increment the index until we reached the offset
-            while fitness_array[index] < offset:
-                index += 1
-            # increment the offset to the next target
-            offset = offset + fitness_array[-1] / count
-            individual_indices.append(population[index])
-        # return all selected individual indices
-        return np.array(individual_indices)
+        return [population[index] for index in selection.sus(cumulative_fitness, 2)]
 
     def create_attacker_population(self, population):
         all_attacker = []
@@ -425,18 +350,25 @@ class Breeder:
         for key, val in self.profession.items():
             print(key, ": ", val)
             
+    @cached_fitness
     def check_profession(self, individual):
         '''
         If the desire and perception to attack opponents is larger enough 
         (attacker_threshold) then the  we consider an individual as an Attacker
+        (see attackers)
         '''
-        dna = individual.get_dna()
-        if (dna[0][3] and dna[1][3]) > self.attacker_threshold: return "Attacker"
+        if self.attackers(individual.genome[np.newaxis])[0]: return "Attacker"
         return "Defender"
 
     def assess_individual_fitness(self, individual):
         """
-        fitness score depending on several factors:
+        fitness score of one individual (see assess_population_fitness)
+        """
+        return float(self.assess_population_fitness([individual])[0])
+    
+    def assess_population_fitness(self, population):
+        """
+        fitness score of every individual depending on several factors:
         - individuals that didn't survive at least one iteration get a 0
         x food rating: how much food did the individual see and how much did it eat?
         - poison rating: how much poison did the individual see and still did it eat?
@@ -451,25 +383,37 @@ class Breeder:
         I do this since I dont want to reward my individuals for having only a desireable DNA set based on my
         assumption (since we know they could be wrong). For the ratings (same for the strategy) I always tought,
         what does my individual want to do? The individual should see the predetaor but should not get attacked from them etc.!
+        
+        The scores of the whole population are computed at once
+        on the statistic table and the genome matrix of the population.
         """
-        statistic = individual.statistic
-        iterations_survied = int(statistic.time_survived / 300)
-        if (iterations_survied is 0): return 0.5
-        #food_rating = (statistic.food_eaten - statistic.food_seen) / iterations_survied
-        poison_rating = (statistic.poison_seen - statistic.poison_eaten) / iterations_survied
-        #potion_rating = (statistic.consumed_potions - statistic.potions_seen) / iterations_survied
-        predator_rating = (statistic.predators_seen - statistic.attacked_by_predators) / iterations_survied
-        if self.check_profession(individual) is "Attacker":
-            offense_rating = (statistic.enemies_attacked + statistic.consumed_corpses) / iterations_survied
-            score = poison_rating + predator_rating + offense_rating**offense_rating
-        else:
-            defense_rating = ( statistic.enemies_attacked * (not individual.dead) ) / iterations_survied
-            score = iterations_survied + poison_rating + predator_rating + defense_rating**defense_rating
-
+        statistics = statistic_table(population)
+        genomes = genome_matrix(population)
+        alive = np.array([not individual.dead for individual in population])
+        iterations_survied = statistics['time_survived'] // 300
+        # the individuals which did not survive an iteration get 0.5 anyways
+        iterations = np.maximum(iterations_survied, 1)
+        poison_rating = (statistics['poison_seen'] - statistics['poison_eaten']) / iterations
+        predator_rating = (statistics['predators_seen'] - statistics['attacked_by_predators']) / iterations
+        offense_rating = (statistics['enemies_attacked'] + statistics['consumed_corpses']) / iterations
+        defense_rating = (statistics['enemies_attacked'] * alive) / iterations
+        score = np.where(self.attackers(genomes),
+                         poison_rating + predator_rating + offense_rating**offense_rating,
+                         iterations_survied + poison_rating + predator_rating + defense_rating**defense_rating)
+        score[iterations_survied == 0] = 0.5
         # Don't allowe negative scores
-        if (score < 0.5): score = 0.5
-        return score
-    
+        return np.where(score < 0.5, 0.5, score)
+
+    def attackers(self, genomes):
+        """
+        True for every row of a genome matrix which is an attacker
+        (perception and desire of opponents above the attacker_threshold)
+        """
+        perception = genomes[:, COLUMN['opponent']]
+        desire = genomes[:, COLUMN['seek_opponents']]
+        # same as (perception and desire) > attacker_threshold
+        return np.where(perception != 0, desire, perception) > self.attacker_threshold
+
     def update_strategy(self, population):
         '''
         adopting the strategy depending on the current population.
@@ -478,13 +422,11 @@ class Breeder:
         '''
         if (self.intermediate_output):
             print("Current strategy\nThreshold: ", self.attacker_threshold, "\nAtackers: ", self.attacker_number)
-        score = 0
-        for individual in population:
-            statistic = individual.statistic
-            iterations_survied = int(statistic.time_survived / 300)
-            aggresion = statistic.enemies_attacked - statistic.attacked_by_predators
-            defense = iterations_survied + statistic.opponents_seen - statistic.attacked_by_opponents
-            score += aggresion - defense
+        statistics = statistic_table(population)
+        iterations_survied = statistics['time_survived'] // 300
+        aggresion = statistics['enemies_attacked'] - statistics['attacked_by_predators']
+        defense = iterations_survied + statistics['opponents_seen'] - statistics['attacked_by_opponents']
+        score = int((aggresion - defense).sum())
         if score > 0:
             if self.attacker_number < 8 : self.attacker_number += 1
         else:
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap, QTransform
+
+
+class AssetCache:
+    """
+    images of all individuals, predators and items
+    every image file is loaded once and shared by all objects showing it
+    rotated versions of the images are built on demand and
+    the least recently used ones are dropped if there are too many
+    """
+    def __init__(self, max_rotated=2048):
+        # path -> QPixmap
+        self.pixmaps = {}
+        # (path, heading, headings) -> rotated QPixmap
+        self.rotated_pixmaps = OrderedDict()
+        # maximum number of rotated pixmaps kept in memory
+        self.max_rotated = max_rotated
+
+    def pixmap(self, path):
+        """
+        get the (shared) pixmap of an image file, load it on first use
+        """
+        pixmap = self.pixmaps.get(path)
+        if pixmap is None:
+            pixmap = QPixmap(path)
+            self.pixmaps[path] = pixmap
+        return pixmap
+
+    def rotated(self, path, heading, headings):
+        """
+        get the pixmap of an image file rotated by heading * 360 / headings degrees
+        (clockwise) around its center
+        """
+        key = (path, heading, headings)
+        pixmap = self.rotated_pixmaps.get(key)
+        if pixmap is None:
+            angle = heading * 360.0 / headings
+            pixmap = self.pixmap(path).transformed(QTransform().rotate(angle),
+                                                   Qt.SmoothTransformation)
+            self.rotated_pixmaps[key] = pixmap
+            while len(self.rotated_pixmaps) > self.max_rotated:
+                self.rotated_pixmaps.popitem(last=False)
+        else:
+            self.rotated_pixmaps.move_to_end(key)
+        return pixmap
+
+    def clear(self):
+        self.pixmaps.clear()
+        self.rotated_pixmaps.clear()
+
+
+# one cache for the whole process
+assets = AssetCache()
@@ -3,6 +3,8 @@ from PyQt5.QtGui import QPainter, QColor, QFont, QBrush, QPen
 from PyQt5.QtCore import Qt, QBasicTimer, QPointF, QRectF, QSizeF, pyqtSignal
 
 from game.egame import EGame
+from gui.renderer import GameRenderer
+from gui.simulation_worker import SimulationWorker
 from gui.statistics_window import StatisticsWindow
 
 class GameFrame(QFrame):
@@ -25,8 +27,7 @@ class GameFrame(QFrame):
                           self.frame_dimension[1])
         #self.setStyleSheet("background-color: " + \
         #    self.global_config['frame']['background_color'])
-        self.setStyleSheet("background-image: " + \
-            self.global_config['frame']['background_image'])
+        # the background image is drawn by the renderer
         
 
 
@@ -34,14 +35,14 @@ class GameFrame(QFrame):
         """
         open a new window to display population details
         """
-        self.statistics_window = StatisticsWindow(self, self.game)
+        self.statistics_window = StatisticsWindow(self, self.current_state())
 
 
     def refresh_statistic_window(self):
         """
         reload the statistic window with the new game instance
         """
-        self.statistics_window.reload(self.game)
+        self.statistics_window.reload(self.current_state())
 
 
     def init_frame(self):
@@ -49,8 +50,16 @@ class GameFrame(QFrame):
         init the frame and declare frame variables
         """
         self.timer = QBasicTimer()
+        self.renderer = GameRenderer(self)
         self.isStarted = False
         self.isPaused = False
+        # update the game in its own thread and paint its latest snapshot
+        self.simulation_thread = self.global_config.get('simulation_thread', False)
+        # frames per second of the worker (0 = as fast as possible)
+        self.tick_rate = self.global_config.get('simulation_tick_rate', 0)
+        # paints per second while the game runs in the worker
+        self.display_rate = self.global_config.get('display_rate', 60)
+        self.worker = None
 
 
     def start(self):
@@ -60,9 +69,17 @@ class GameFrame(QFrame):
         if self.isPaused:
             return
         print("start game")
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
         self.game = EGame(self)
         self.game.start()
-        self.timer.start(self.game_speed, self)
+        if self.simulation_thread:
+            self.worker = SimulationWorker(self.game, self.tick_rate, self.display_rate)
+            self.worker.start()
+            self.timer.start(int(1000 / self.display_rate), self)
+        else:
+            self.timer.start(self.game_speed, self)
         self.msg2Statusbar.emit(str("new game started"))
         self.isStarted = True
         # check if there is a statistic window opened
@@ -73,8 +90,41 @@ class GameFrame(QFrame):
             self.refresh_statistic_window()
 
 
+    def fast_forward(self, frames):
+        """
+        play the given number of frames without painting them
+        """
+        if not self.isStarted or not self.game.running:
+            return
+        if self.worker is not None:
+            # the worker plays the frames without waiting for its tick rate
+            self.worker.fast_forward(frames)
+            self.msg2Statusbar.emit("skipping " + str(frames) + " frames")
+            return
+        played = self.game.step(frames)
+        self.msg2Statusbar.emit("skipped " + str(played) + " frames")
+        self.update()
+        if (
+            hasattr(self, "statistics_window")
+            and self.statistics_window is not None
+        ):
+            self.refresh_statistic_window()
+
+
+    def current_state(self):
+        """
+        the game or its latest snapshot if it runs in a worker thread
+        """
+        if self.worker is not None:
+            return self.worker.latest()
+        return self.game
+
+
     def stop_timer(self):
-        self.timer.stop()
+        # the worker calls this when the game ends, the paint timer
+        # is stopped in timerEvent after the last snapshot was painted
+        if self.worker is None:
+            self.timer.stop()
 
 
     def timerEvent(self, event):
@@ -84,7 +134,12 @@ class GameFrame(QFrame):
         redraws the objects
         """
         if self.isStarted:
-            self.game.update()
+            if self.worker is not None:
+                # paint the latest snapshot, the game is updated by the worker
+                if not self.worker.is_alive():
+                    self.timer.stop()
+            else:
+                self.game.update()
             self.update()
             
 
@@ -93,4 +148,6 @@ class GameFrame(QFrame):
         painter = QPainter(self)
         # paint only when game is started
         if self.isStarted:
-            self.game.draw(painter)
+            self.renderer.draw(painter, self.current_state())
+        else:
+            self.renderer.draw_background(painter)
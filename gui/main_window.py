@@ -1,4 +1,4 @@
-from PyQt5.QtWidgets import QMainWindow, QAction
+from PyQt5.QtWidgets import QMainWindow, QAction, QInputDialog
 from PyQt5.QtGui import QIcon
 
 from .game_frame import GameFrame
@@ -69,17 +69,31 @@ class App(QMainWindow):
 
     def add_main_menu_items(self):
         """
-        add all Game menu items (Start Game and Exit)
+        add all Game menu items (Start Game, Fast-forward and Exit)
         """
         self.startButton = QAction('Start Game', self)
         self.startButton.triggered.connect(lambda: self.start_game())
+        self.fastForwardButton = QAction('Fast-forward', self)
+        self.fastForwardButton.triggered.connect(lambda: self.fast_forward())
         self.exitButton = QAction('Exit', self)
         self.exitButton.triggered.connect(self.close)
 
         self.gameMenu.addAction(self.startButton)
+        self.gameMenu.addAction(self.fastForwardButton)
         self.gameMenu.addAction(self.exitButton)
 
 
+    def fast_forward(self):
+        """
+        ask for a number of frames and play them without painting
+        """
+        frames, ok = QInputDialog.getInt(self, "Fast-forward", "frames to skip:",
+                                         self.global_config.get('fast_forward_frames', 1000),
+                                         1, 1000000)
+        if ok:
+            self.game_frame.fast_forward(frames)
+
+
     def start_game(self):
         """
         start the game (create a new game instance)
@@ -0,0 +1,293 @@
+import math
+import re
+
+from PyQt5.QtGui import QColor, QPainter, QPixmap, QPolygonF
+from PyQt5.QtCore import Qt, QPointF, QRectF
+
+from gui.assets import assets
+
+
+class GameRenderer:
+    """
+    draws the state of an EGame with a QPainter
+    the simulation itself does not know anything about Qt,
+    all images, colors and debug drawings live here
+    """
+    # item types which do not move and the shape drawn if they have no image
+    STATIC_ITEMS = {'food': 'draw_rect',
+                    'poison': 'draw_rect',
+                    'health_potion': 'draw_hexagon',
+                    'corpse': 'draw_hexagon'}
+    def __init__(self, parent):
+        # the GameFrame the game is drawn on
+        self.parent = parent
+        # images shared by all objects, every file is loaded once
+        self.assets = assets
+        global_config = self.parent.global_config
+        # individuals are drawn with images which were rotated in advance to
+        # one of this many headings (0 rotates every image while painting)
+        self.headings = global_config.get('sprite_headings', 64)
+        self.assets.max_rotated = global_config.get('sprite_cache_size', 2048)
+        # path of the background image, e.g. "url(./img/background.png)"
+        background = re.match(r"\s*url\((.*)\)\s*$",
+                              global_config['frame'].get('background_image', ""))
+        self.background = background.group(1) if background else ""
+        # background, border and items are drawn into an off-screen layer
+        # new items are added to it, it is only redrawn if an item was removed
+        self.cache_static_layer = global_config.get('cache_static_layer', True)
+        self.static_layer = None
+        self.static_layer_key = None
+        # type -> (removals, number of items) when the layer was drawn
+        self.static_layer_items = {}
+
+    def draw(self, painter, game):
+        """
+        draw all game elements on the frame
+        """
+        if self.parent.parent_window.fastmode:
+            self.draw_background(painter)
+            return
+        if self.cache_static_layer:
+            painter.drawPixmap(0, 0, self.cached_static_layer(game))
+        else:
+            self.draw_static(painter, game)
+        # only the moving objects are drawn every frame
+        for p in game.game_objects['pop1']:
+            if not p.dead:
+                self.draw_individual(painter, p)
+        for p in game.game_objects['pop2']:
+            if not p.dead:
+                self.draw_individual(painter, p)
+        for p in game.game_objects['predators']:
+            self.draw_individual(painter, p)
+
+    def cached_static_layer(self, game):
+        """
+        get the layer with background, border and items
+        items which were spawned since the last frame are drawn on top of it,
+        it is redrawn completely if an item was eaten
+        """
+        key = (game.serial,
+               self.parent.width(),
+               self.parent.height(),
+               self.parent.parent_window.debug['repell_frame'])
+        items = {type: (game.game_objects[type].removals, len(game.game_objects[type]))
+                 for type in self.STATIC_ITEMS}
+        redraw = key != self.static_layer_key or any(
+            items[type][0] != self.static_layer_items[type][0] for type in items)
+        if redraw:
+            self.static_layer = QPixmap(self.parent.width(), self.parent.height())
+            self.static_layer.fill(Qt.transparent)
+        painter = QPainter(self.static_layer)
+        if redraw:
+            self.draw_static(painter, game)
+        else:
+            # items are appended, the new ones are at the end of the lists
+            for type, draw_polygon in self.STATIC_ITEMS.items():
+                for item in game.game_objects[type][self.static_layer_items[type][1]:]:
+                    self.draw_item(painter, item, getattr(self, draw_polygon))
+        painter.end()
+        self.static_layer_key = key
+        self.static_layer_items = items
+        return self.static_layer
+
+    def draw_static(self, painter, game):
+        """
+        draw everything which does not move
+        """
+        self.draw_background(painter)
+        self.draw_border(painter, game)
+        for type, draw_polygon in self.STATIC_ITEMS.items():
+            for item in game.game_objects[type]:
+                self.draw_item(painter, item, getattr(self, draw_polygon))
+
+    def draw_background(self, painter):
+        """
+        tile the background image over the frame
+        """
+        if self.background:
+            painter.drawTiledPixmap(0, 0, self.parent.width(), self.parent.height(),
+                                    self.assets.pixmap(self.background))
+
+    def draw_border(self, painter, game):
+        """draw the inner field where objects are repelled on"""
+        # but only if the respective debug setting is enabled
+        if self.parent.parent_window.debug['repell_frame']:
+            color = QColor(0, 0, 0, 0)
+            w = self.parent.frameGeometry().width()
+            h = self.parent.frameGeometry().height()
+            position = [w - 2 * game.border_width, h - 2 * game.border_width]
+            painter.setBrush(color)
+            painter.drawRect(game.border_width, game.border_width, position[0], position[1])
+
+    # items
+
+    def draw_item(self, painter, item, draw_polygon):
+        """
+        draw an item with its image or as polygon if it has none
+        """
+        if item.image == "":
+            draw_polygon(painter, item)
+        else:
+            self.draw_item_image(painter, item)
+
+    def draw_item_image(self, painter, item):
+        item_image = self.assets.pixmap(item.image)
+        painter.drawPixmap(QPointF(item._position[0]-(item_image.height()/2),
+                                   item._position[1]-(item_image.width()/2)),
+                                   item_image)
+
+    def draw_rect(self, painter, item):
+        """
+        draw food and poison without image
+        """
+        color = QColor(item.color)
+        painter.setBrush(color)
+        painter.setPen(QColor(0, 0, 0))
+        painter.drawRect(QRectF(item._position[0]-item.size/2,
+                                item._position[1]-item.size/2,
+                                item.size,
+                                item.size))
+
+    def draw_hexagon(self, painter, item):
+        """
+        draw heal potions and corpses without image
+        """
+        color = QColor(item.color)
+        painter.setPen(QColor(0, 0, 0))
+        painter.setBrush(color)
+
+        r = item.size/2
+
+        polygon = QPolygonF()
+        polygon.append(QPointF(item._position[0] + r, item._position[1] + r/2))
+        polygon.append(QPointF(item._position[0]    , item._position[1] + r  ))
+        polygon.append(QPointF(item._position[0] - r, item._position[1] + r/2))
+        polygon.append(QPointF(item._position[0] - r, item._position[1] - r/2))
+        polygon.append(QPointF(item._position[0]    , item._position[1] - r  ))
+        polygon.append(QPointF(item._position[0] + r, item._position[1] - r/2))
+
+        painter.drawPolygon(polygon)
+
+    # individuals and predators
+
+    def draw_individual(self, painter, individual):
+        """
+        draw the individual
+        """
+        # self.draw_circle(painter, individual)
+        self.draw_image(painter, individual)
+        self.draw_debug(painter, individual)
+
+    def display_image(self, individual):
+        """
+        get the pixmap of the animation frame the individual currently shows
+        """
+        return self.assets.pixmap(individual.image[individual.display_frame])
+
+    def draw_image(self, painter, individual):
+        """
+        draw the individual
+        """
+        # rotate the image so that it points to the direction of the velocity
+        vec1 = (0, -1)
+        vec2 = individual.velocity
+        angle = math.atan2(vec2[1], vec2[0]) - math.atan2(vec1[1], vec1[0])
+        angle = math.degrees(angle)
+        if self.headings:
+            # draw the closest pre-rotated image centered on the individual
+            heading = round(angle * self.headings / 360.0) % self.headings
+            path = individual.image[individual.display_frame]
+            rotated = self.assets.rotated(path, heading, self.headings)
+            painter.drawPixmap(QPointF(individual._position[0] - rotated.width()/2,
+                                       individual._position[1] - rotated.height()/2),
+                               rotated)
+            return
+        display_image = self.display_image(individual)
+        half_x = display_image.width()/2
+        half_y = display_image.height()/2
+        pos_x = individual._position[0]
+        pos_y = individual._position[1]
+
+        painter.save()
+        painter.translate(pos_x, pos_y)
+        painter.rotate(angle)
+        painter.translate(-half_x, -half_y)
+        painter.drawPixmap(0, 0, display_image)
+        painter.restore()
+
+    def draw_circle(self, painter, individual):
+        """
+        draws a circle at the position of the individual with its color
+        """
+        color = QColor(individual.color[0][0], individual.color[0][1], individual.color[0][2])
+        position = QPointF(individual._position[0], individual._position[1])
+        painter.setBrush(color)
+        painter.setPen(QColor(0, 0, 0, 0))
+        painter.drawEllipse(position, individual.radius, individual.radius)
+
+    def draw_debug(self, painter, individual):
+        """
+        draws all debug elements such as vectors and perceptions
+        """
+        self.draw_health(painter, individual)
+        position = QPointF(individual._position[0], individual._position[1])
+        perception = individual.perception
+        self.draw_debug_radius(painter, 'food_perception', position, 'green',
+                               individual, perception.food)
+        self.draw_debug_radius(painter, 'poison_perception', position, 'red',
+                               individual, perception.poison)
+        self.draw_debug_radius(painter, 'potion_perception', position, 'violett',
+                               individual, perception.health_potion)
+        self.draw_debug_radius(painter, 'opponent_perception', position, 'blue',
+                               individual, perception.opponent)
+        self.draw_debug_radius(painter, 'predator_perception', position, 'black',
+                               individual, perception.predator)
+        self.draw_debug_radius(painter, 'corpse_perception', position, 'brown',
+                               individual, perception.corpse)
+        self.draw_debug_vector(painter, 'velocity_vector', position, "black",
+                               individual.velocity)
+
+    def draw_debug_radius(self, painter, setting, position, color, individual, perception):
+        """
+        draw the perception radius around the individual
+        """
+        if self.parent.parent_window.debug[setting]:
+            # draw perception
+            painter.setPen(QColor(color))
+            painter.setBrush(QColor(0, 0, 0, 0))
+            painter.drawEllipse(position,
+                                individual.perception.absolute(perception),
+                                individual.perception.absolute(perception))
+
+    def draw_debug_vector(self, painter, setting, position, color, vector):
+        """
+        draw the given vector on top of the individual
+        """
+        if self.parent.parent_window.debug[setting]:
+            color = QColor(color)
+            target = position + QPointF(vector[0]*100, vector[1]*100)
+            painter.setBrush(color)
+            painter.setPen(QColor("black"))
+            painter.drawLine(position, target)
+
+    def draw_health(self, painter, individual):
+        """
+        draw health on top of the individual
+        """
+        if self.parent.parent_window.debug['health']:
+            health = individual.health
+            # draw health text
+            if health <= 0.2:
+                color = QColor("red")
+            else:
+                color = QColor("black")
+            if health >= 0.1:
+                position = QPointF(individual._position[0]-8, individual._position[1]+4)
+            else:
+                position = QPointF(individual._position[0]-4, individual._position[1]+4)
+            painter.setBrush(color)
+            painter.setPen(color)
+            if health < 1:
+                draw_text = str(int(health * 100))
+                painter.drawText(position, draw_text)
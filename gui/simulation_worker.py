@@ -0,0 +1,69 @@
+import threading
+import time
+
+from game.snapshot import GameSnapshot
+
+
+class SimulationWorker(threading.Thread):
+    """
+    updates a game in its own thread, independent of the paint rate of the GUI
+    the latest state is published as a GameSnapshot: the GUI reads the front
+    snapshot while the next one is built, then they are swapped
+    snapshots which are not picked up before the next one are dropped
+    """
+    def __init__(self, game, tick_rate=0, publish_rate=60):
+        super().__init__(daemon=True)
+        self.game = game
+        # frames per second (0 = as fast as possible)
+        self.tick_rate = tick_rate
+        # snapshots per second
+        self.publish_interval = 1.0 / publish_rate
+        self.lock = threading.Lock()
+        self.snapshot = GameSnapshot(game)
+        # frames to play without waiting for the tick rate
+        self.fast_forward_frames = 0
+        self.stopped = False
+
+    def run(self):
+        next_tick = time.perf_counter()
+        last_publish = next_tick
+        while not self.stopped and self.game.running:
+            self.game.update()
+            now = time.perf_counter()
+            if now - last_publish >= self.publish_interval:
+                self.publish()
+                last_publish = now
+            with self.lock:
+                fast_forward = self.fast_forward_frames > 0
+                if fast_forward:
+                    self.fast_forward_frames -= 1
+            if self.tick_rate and not fast_forward:
+                next_tick = max(next_tick + 1.0 / self.tick_rate, now - 1.0)
+                time.sleep(max(0.0, next_tick - time.perf_counter()))
+        self.publish()
+
+    def publish(self):
+        """
+        build a snapshot of the game and make it the front snapshot
+        """
+        snapshot = GameSnapshot(self.game)
+        with self.lock:
+            self.snapshot = snapshot
+
+    def latest(self):
+        """
+        get the latest published snapshot
+        """
+        with self.lock:
+            return self.snapshot
+
+    def fast_forward(self, frames):
+        """
+        play the next frames as fast as possible
+        """
+        with self.lock:
+            self.fast_forward_frames += frames
+
+    def stop(self):
+        self.stopped = True
+        self.join()
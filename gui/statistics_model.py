@@ -0,0 +1,128 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+
+
+# rows of the statistics table: label and how to read the value from an individual
+ROWS = [
+    ("Dead", lambda i: i.dead),
+    ("Frames Survived", lambda i: i.statistic.time_survived),
+    # perception
+    ("Food Perception", lambda i: i.perception.food),
+    ("Poison Perception", lambda i: i.perception.poison),
+    ("Heal Potion Perception", lambda i: i.perception.health_potion),
+    ("Corpse Perception", lambda i: i.perception.corpse),
+    ("Opponent Perception", lambda i: i.perception.opponent),
+    ("Predator Perception", lambda i: i.perception.predator),
+    # desires
+    ("Seek Food Desire", lambda i: i.desires.seek_food),
+    ("Dodge Poison Desire", lambda i: i.desires.dodge_poison),
+    ("Seek Heal Potion Desire", lambda i: i.desires.seek_potion),
+    ("Seek Opponents Desire", lambda i: i.desires.seek_opponents),
+    ("Seek Corpse Desire", lambda i: i.desires.seek_corpse),
+    ("Dodge Predators Desire", lambda i: i.desires.dodge_predators),
+    # abilities
+    ("Increased Armor", lambda i: i.abilities.armor_ability),
+    ("Increased Speed", lambda i: i.abilities.speed),
+    ("Increased Poison Resistance", lambda i: i.abilities.poison_resistance),
+    ("Strength", lambda i: i.abilities.strength),
+    ("Toxicity", lambda i: i.abilities.toxicity),
+    # statistics
+    ("Food Eaten", lambda i: i.statistic.food_eaten),
+    ("Poison Eaten", lambda i: i.statistic.poison_eaten),
+    ("Consumed Heal Potions", lambda i: i.statistic.consumed_potions),
+    ("Consumed Corpses", lambda i: i.statistic.consumed_corpses),
+    ("Attacked Enemies", lambda i: i.statistic.enemies_attacked),
+    ("Attacked by Opponents", lambda i: i.statistic.attacked_by_opponents),
+    ("Attacked by Predators", lambda i: i.statistic.attacked_by_predators),
+    ("Food Seen", lambda i: i.statistic.food_seen),
+    ("Poison Seen", lambda i: i.statistic.poison_seen),
+    ("Heal Potion Seen", lambda i: i.statistic.potions_seen),
+    ("Opponent Seen", lambda i: i.statistic.opponents_seen),
+    ("Predator Seen", lambda i: i.statistic.predators_seen),
+    ("Corpse Seen", lambda i: i.statistic.corpses_seen),
+]
+
+POPULATIONS = ["pop1", "pop2"]
+
+
+class StatisticsModel(QAbstractTableModel):
+    """
+    table of the traits and statistics of all individuals
+    one row per attribute, one column per individual
+    the values are copied from the game on refresh, so only the
+    cells that changed since the last refresh are repainted
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # column -> tuple of the row values
+        self.columns = []
+        self.headers = []
+
+    def read(self, game):
+        """
+        headers and values of all individuals of the game
+        """
+        headers = []
+        columns = []
+        for pop in POPULATIONS:
+            for number, individual in enumerate(game.game_objects[pop]):
+                headers.append(game.colors[pop][1] + " #" + str(number + 1))
+                columns.append(tuple(value(individual) for _, value in ROWS))
+        return headers, columns
+
+    def reload(self, game):
+        """
+        replace the whole table with the values of the game
+        """
+        self.beginResetModel()
+        self.headers, self.columns = self.read(game)
+        self.endResetModel()
+
+    def refresh(self, game):
+        """
+        copy the values of the game and signal the cells that changed
+        """
+        headers, columns = self.read(game)
+        if headers != self.headers:
+            # a new generation or another game, the layout changed
+            self.beginResetModel()
+            self.headers, self.columns = headers, columns
+            self.endResetModel()
+            return
+        old_columns = self.columns
+        self.columns = columns
+        for column, (old, new) in enumerate(zip(old_columns, columns)):
+            if old == new:
+                continue
+            # one signal per run of changed cells in the column
+            first = None
+            for row in range(len(ROWS) + 1):
+                changed = row < len(ROWS) and old[row] != new[row]
+                if changed and first is None:
+                    first = row
+                elif not changed and first is not None:
+                    self.dataChanged.emit(self.index(first, column),
+                                          self.index(row - 1, column),
+                                          [Qt.DisplayRole])
+                    first = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(ROWS)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return QVariant()
+        return str(self.columns[index.column()][index.row()])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return ROWS[section][0]
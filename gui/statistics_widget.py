@@ -1,4 +1,5 @@
-from PyQt5.QtWidgets import QWidget, QTableWidget, QVBoxLayout, QTableWidgetItem
+from PyQt5.QtWidgets import QWidget, QTableView, QVBoxLayout
+from gui.statistics_model import StatisticsModel
 
 
 class StatisticsWidget(QWidget):
@@ -27,12 +28,11 @@ class StatisticsWidget(QWidget):
                          self.width,
                          self.height)
         
-        self.table_widget = QTableWidget()
-        self.table_widget.setRowCount(32)  # attributes
-        num_individuals = self.parent.parent_window.config.global_config['num_individuals'] * 2
-        self.table_widget.setColumnCount(num_individuals)  # individuals
-
-        self.display_statistics()
+        # the view only repaints the cells the model reports as changed
+        self.model = StatisticsModel(self)
+        self.model.reload(self.game)
+        self.table_widget = QTableView()
+        self.table_widget.setModel(self.model)
 
         self.layout = QVBoxLayout()
         self.layout.addWidget(self.table_widget)
@@ -46,71 +46,11 @@ class StatisticsWidget(QWidget):
         reloads all statistics with the given game instance
         """
         self.game = game
-        self.table_widget.clear()
+        self.model.reload(game)
 
 
     def update(self):
         """
-        redraw statistics
-        """
-        self.display_statistics()
-
-
-    def display_statistics(self):
-        """
-        create a table for statistics for all individuals
+        copy the current values into the model
         """
-        populations = ["pop1", "pop2"]
-        
-        header = []
-        for pop in populations:
-            for i in range(len(self.game.game_objects[pop])):
-                header.append(self.game.colors[pop][1] + " #" + str(i+1))
-
-        # self.table_widget.setSpan(1,0,7,0)
-        # setItem(row, column, item)
-
-        self.table_widget.setHorizontalHeaderLabels(header)
-        v_header_labels = [
-            "Dead",
-            "Frames Survived",
-            "Food Perception",
-            "Poison Perception",
-            "Heal Potion Perception",
-            "Corpse Perception",
-            "Opponent Perception",
-            "Predator Perception",
-            "Seek Food Desire",
-            "Dodge Poison Desire",
-            "Seek Heal Potion Desire",
-            "Seek Opponents Desire",
-            "Seek Corpse Desire",
-            "Dodge Predators Desire",
-            "Increased Armor",
-            "Increased Speed",
-            "Increased Poison Resistance",
-            "Strength",
-            "Toxicity",
-            "Food Eaten",
-            "Poison Eaten",
-            "Consumed Heal Potions",
-            "Consumed Corpses",
-            "Attacked Enemies",
-            "Attacked by Opponents",
-            "Attacked by Predators",
-            "Food Seen",
-            "Poison Seen",
-            "Heal Potion Seen",
-            "Opponent Seen",
-            "Predator Seen",
-            "Corpse Seen"
-        ]
-        self.table_widget.setVerticalHeaderLabels(v_header_labels)
-        pop_offset = 0
-        for pop in populations:
-            index = 0
-            for individual in self.game.game_objects[pop]:
-                individual.statistic_to_table(
-                    self.table_widget, pop_offset+index)
-                index += 1
-            pop_offset += len(self.game.game_objects[pop])
+        self.model.refresh(self.game)
@@ -9,13 +9,18 @@ class StatisticsWindow(QMainWindow):
         self.parent_window = parent
         self.statistics_widget = StatisticsWidget(self, game)
         self.timer = QBasicTimer()
-        self.timer.start(20, self)
+        # refreshes per second, the table is for reading, not for every frame
+        # (at least one, 0 or less would never refresh)
+        refresh_rate = max(1, parent.global_config.get('statistics_refresh_rate', 5))
+        self.timer.start(int(1000 / refresh_rate), self)
         self.show()
     
     def update(self):
         """
         pass through and update the statistic widget
         """
+        # show the latest state (a snapshot if the game runs in a worker thread)
+        self.statistics_widget.game = self.parent_window.current_state()
         self.statistics_widget.update()
 
     def reload(self, game):
@@ -1,13 +1,8 @@
 #!/usr/bin/env python3
 
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QIcon
-from gui.main_window import App
-from fastmode import Fastmode
+from tournament import Tournament, load_optimizer
 from config import Config
 import sys
-import importlib.util
-import threading
 if __name__ == "__main__":
 
     # program parameter:
@@ -20,12 +15,8 @@ if __name__ == "__main__":
     config = Config(config_path)
     optimizer1_path = sys.argv[2]
     optimizer2_path = sys.argv[3]
-    spec1 = importlib.util.spec_from_file_location("opti1", optimizer1_path)
-    spec2 = importlib.util.spec_from_file_location("opti2", optimizer2_path)
-    module1 = importlib.util.module_from_spec(spec1)
-    module2 = importlib.util.module_from_spec(spec2)
-    spec1.loader.exec_module(module1)
-    spec2.loader.exec_module(module2)
+    module1 = load_optimizer(optimizer1_path, "opti1")
+    module2 = load_optimizer(optimizer2_path, "opti2")
 
     # fast mode additional parameter: bool enabled, int runs
     fastmode = False
@@ -33,16 +24,14 @@ if __name__ == "__main__":
     if len(sys.argv) > 4:
         fastmode = sys.argv[4]
         fastmode_runs = int(sys.argv[5])
-        threads = []
-        for i in range(fastmode_runs):
-            thread = Fastmode(i, config, [module1, module2])
-            threads.append(thread)
-            thread.start()
-        for thread in threads:
-            thread.join(600) # timeout in seconds 10min = 10*60 = 600
-        results = []
-        for thread in threads:
-            results.append(thread.result)
+        # every game runs in its own process, as many at once as there are cores
+        timeout = config.global_config.get('fastmode_timeout', 600) # seconds per game
+        tournament = Tournament(config_path,
+                                [optimizer1_path, optimizer2_path],
+                                fastmode_runs,
+                                timeout=timeout,
+                                processes=config.global_config.get('fastmode_processes'))
+        results = tournament.run()
         yellow = 0
         blue = 0
         too_long_computation = 0
@@ -53,7 +42,7 @@ if __name__ == "__main__":
                 yellow += 1
             else:
                 too_long_computation += 1
-        print("timeout threads (longer than 10min):", too_long_computation)
+        print("timeout games (longer than " + str(timeout) + "s):", too_long_computation)
         if yellow > blue:
             print("yellow wins the competition with " + str(yellow) + ":" + str(blue))
             winning_breeder = optimizer2_path
@@ -71,6 +60,10 @@ if __name__ == "__main__":
             f.write(result + "\n")
 
     else:
+        # the simulation core runs without Qt, only the GUI needs it
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtGui import QIcon
+        from gui.main_window import App
         app = QApplication(sys.argv)
         app.setWindowIcon(QIcon('./img/game_icon3.png'))
         GUI = App(config, [module1, module2], fastmode, fastmode_runs)
@@ -0,0 +1,93 @@
+from config import Config
+from fastmode import Fastmode
+import importlib.util
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import time
+
+
+def load_optimizer(path, name):
+    """
+    import a breeder module from its file path
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def play_game(game_id, config_path, optimizer_paths, connection):
+    """
+    worker: play one headless game and send its result back
+    the config is read in the worker, as in benchmark.run_case
+    """
+    config = Config(config_path)
+    optimizers = [load_optimizer(path, "opti" + str(i + 1))
+                  for i, path in enumerate(optimizer_paths)]
+    result = Fastmode(game_id, config, optimizers).run()
+    connection.send(result)
+    connection.close()
+
+
+class Tournament:
+    """
+    plays a number of headless games in a pool of worker processes
+    every game runs in its own process so it can be killed after its timeout
+    """
+    def __init__(self, config_path, optimizer_paths, runs, timeout=600, processes=None):
+        self.config_path = config_path
+        self.optimizer_paths = optimizer_paths
+        self.runs = runs
+        # timeout of a single game in seconds
+        self.timeout = timeout
+        # number of games played at the same time
+        self.processes = processes or os.cpu_count() or 1
+
+    def run(self):
+        """
+        play all games and return their results in order
+        0 = blue breeder, 1 = yellow breeder, None = timeout / crashed game
+        """
+        results = [None] * self.runs
+        pending = list(range(self.runs))
+        # game id -> (process, connection, start time)
+        running = {}
+        while pending or running:
+            # keep all processes busy
+            while pending and len(running) < self.processes:
+                game_id = pending.pop(0)
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(target=play_game,
+                                                  args=(game_id,
+                                                        self.config_path,
+                                                        self.optimizer_paths,
+                                                        sender),
+                                                  daemon=True)
+                process.start()
+                # the worker holds the only sending end now
+                sender.close()
+                running[game_id] = (process, receiver, time.monotonic())
+
+            # sleep until a game finishes or the next game runs out of time
+            next_deadline = min(started for _, _, started in running.values()) + self.timeout
+            wait([receiver for _, receiver, _ in running.values()],
+                 timeout=max(0, next_deadline - time.monotonic()))
+
+            for game_id, (process, receiver, started) in list(running.items()):
+                if receiver.poll():
+                    try:
+                        results[game_id] = receiver.recv()
+                    except EOFError:
+                        # the worker died without sending a result
+                        print("game", game_id, "crashed")
+                    process.join()
+                elif time.monotonic() - started > self.timeout:
+                    print("game", game_id, "timed out after", self.timeout, "seconds")
+                    process.terminate()
+                    process.join()
+                else:
+                    continue
+                receiver.close()
+                del running[game_id]
+        return results